@@ -1,3 +1,6 @@
+import os
+from importlib.util import find_spec
+
 import typer
 import uvicorn
 
@@ -8,6 +11,14 @@ app = typer.Typer(pretty_exceptions_enable=True)
 
 @app.command(name="run-app")
 def run_app():
+    loop, http = settings.APP_LOOP, settings.APP_HTTP
+    if loop == "uvloop" and find_spec("uvloop") is None:
+        loop = "asyncio"
+    if http == "httptools" and find_spec("httptools") is None:
+        http = "h11"
+    # uvicorn ignores workers when reload is on
+    workers = None if settings.APP_RELOAD else settings.APP_WORKERS or os.cpu_count() or 1
+
     uvicorn.run(
         app="src.main:app",
         host=settings.APP_HOSTNAME,
@@ -15,7 +26,10 @@ def run_app():
         reload=settings.APP_RELOAD,
         log_level=settings.APP_LOG_LEVEL,
         access_log=settings.APP_ACCESS_LOG,
-        loop=settings.APP_LOOP,
+        loop=loop,
+        http=http,
+        workers=workers,
+        proxy_headers=True,
     )
 
 
@@ -1,9 +1,13 @@
 import logging
-from typing import Optional
+import time
+from functools import lru_cache
+from types import MappingProxyType
 
 import boto3
 from botocore import exceptions
-from fastapi import Depends, status
+from botocore.config import Config
+from fastapi import Depends, Request, status
+from fastapi.concurrency import run_in_threadpool
 
 from src.config import settings
 from .error_codes import SfsErrorCodes
@@ -12,46 +16,89 @@ from .exception import CustomHTTPException
 logging.basicConfig(format="%(message)s", level=logging.INFO)
 _log = logging.getLogger(__name__)
 
-_botoclient: Optional[boto3.client] = None
-
-
-def get_boto_client() -> boto3.client:
-    global _botoclient
-
-    if _botoclient is None:
-        _log.info("==> Connecting to Minio server...")
-        _botoclient = boto3.client(
-            "s3",
-            endpoint_url=settings.STORAGE_HOST,
-            aws_access_key_id=settings.STORAGE_ACCESS_KEY,
-            aws_secret_access_key=settings.STORAGE_SECRET_KEY,
-            region_name=settings.STORAGE_REGION_NAME,
-        )
-        try:
-            _botoclient.list_buckets()
-            _log.info("==> Connected to Minio server successfully !")
-        except (exceptions.ClientError, exceptions.BotoCoreError, exceptions.NoCredentialsError) as err:
-            _log.error("==> An error occurred while connecting to Minio server.")
-            raise CustomHTTPException(
-                error_code=SfsErrorCodes.SFS_UNKNOWN_ERROR,
-                error_message=err.response.get("Error").get("Message"),
-                status_code=err.response.get("ResponseMetadata").get("HTTPStatusCode"),
-            ) from err
+# bucket name -> monotonic time until which the bucket is known to exist
+_bucket_exists_cache: dict[str, float] = {}
+
+_EMPTY = MappingProxyType({})
+_DEFAULT_ERROR_MESSAGE = "An error occurred"
+
+
+@lru_cache(maxsize=1)
+def config_boto_client() -> boto3.client:
+    """
+    Connect to minio server and return the client
+
+    The client is created once per process and shared by every request.
+    """
+
+    _log.info("==> Connecting to Minio server...")
+    botoclient = boto3.client(
+        "s3",
+        endpoint_url=settings.STORAGE_HOST,
+        aws_access_key_id=settings.STORAGE_ACCESS_KEY,
+        aws_secret_access_key=settings.STORAGE_SECRET_KEY,
+        region_name=settings.STORAGE_REGION_NAME,
+        config=Config(
+            max_pool_connections=settings.STORAGE_POOL_CONNECTIONS,
+            retries={"max_attempts": 3, "mode": "standard"},
+            tcp_keepalive=True,
+        ),
+    )
+    try:
+        botoclient.list_buckets()
+        _log.info("==> Connected to Minio server successfully !")
+    except (exceptions.ClientError, exceptions.BotoCoreError, exceptions.NoCredentialsError) as err:
+        _log.error("==> An error occurred while connecting to Minio server.")
+        error_message, status_code = get_boto_error(err, default_status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        raise CustomHTTPException(
+            error_code=SfsErrorCodes.SFS_UNKNOWN_ERROR, error_message=error_message, status_code=status_code
+        ) from err
+
+    return botoclient
+
+
+def get_boto_error(exc: Exception, default_status: int = status.HTTP_400_BAD_REQUEST) -> tuple[str, int]:
+    """
+    Extract the error message and HTTP status code from a botocore exception.
+
+    :param exc: The ClientError or BotoCoreError raised by boto3
+    :type exc: Exception
+    :param default_status: Status code used when the response does not carry one
+    :type default_status: int
+    :return: The error message and the HTTP status code
+    :rtype: tuple[str, int]
+    """
 
-    return _botoclient
+    response = getattr(exc, "response", None) or _EMPTY
+    error = response.get("Error") or _EMPTY
+    metadata = response.get("ResponseMetadata") or _EMPTY
+    return error.get("Message", _DEFAULT_ERROR_MESSAGE), int(metadata.get("HTTPStatusCode", default_status))
 
 
-def check_bucket_exists(bucket_name: str, botoclient: boto3.client = Depends(get_boto_client)) -> str:
+def get_boto_client(request: Request) -> boto3.client:
+    """
+    Return the S3 client created at application startup.
+    """
+
+    return request.app.boto_client
+
+
+async def check_bucket_exists(bucket_name: str, botoclient: boto3.client = Depends(get_boto_client)) -> str:
     """
     Check if bucket name exist
+
+    The blocking head_bucket call runs in the threadpool so the event loop keeps serving other requests.
+    A successful check is remembered for STORAGE_BUCKET_CACHE_TTL seconds.
     """
 
+    if _bucket_exists_cache.get(bucket_name, 0.0) > time.monotonic():
+        return bucket_name
     try:
-        botoclient.head_bucket(Bucket=bucket_name)
-        _log.warning(f"==> Bucket '{bucket_name}' exists.")
-    except (exceptions.ClientError, exceptions.BotoCoreError) as exc:
-        error_message = exc.response.get("Error", {}).get("Message", "An error occurred")
-        status_code = int(exc.response.get("ResponseMetadata", {}).get("HTTPStatusCode", status.HTTP_400_BAD_REQUEST))
+        await run_in_threadpool(botoclient.head_bucket, Bucket=bucket_name)
+        _log.debug(f"==> Bucket '{bucket_name}' exists.")
+    except exceptions.ClientError as exc:
+        invalidate_bucket_cache(bucket_name)
+        error_message, status_code = get_boto_error(exc)
 
         if status_code == status.HTTP_404_NOT_FOUND:
             raise CustomHTTPException(
@@ -71,5 +118,28 @@ def check_bucket_exists(bucket_name: str, botoclient: boto3.client = Depends(get
                 error_message="An unknown error occurred while checking the bucket.",
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             ) from exc
+    except exceptions.BotoCoreError as exc:
+        raise CustomHTTPException(
+            error_code=SfsErrorCodes.SFS_UNKNOWN_ERROR,
+            error_message=f"An error occurred while checking the bucket '{bucket_name}': {exc}",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        ) from exc
 
+    remember_bucket_exists(bucket_name)
     return bucket_name
+
+
+def remember_bucket_exists(bucket_name: str) -> None:
+    """
+    Record a bucket as existing for STORAGE_BUCKET_CACHE_TTL seconds.
+    """
+
+    _bucket_exists_cache[bucket_name] = time.monotonic() + settings.STORAGE_BUCKET_CACHE_TTL
+
+
+def invalidate_bucket_cache(bucket_name: str) -> None:
+    """
+    Forget the cached existence check of a bucket.
+    """
+
+    _bucket_exists_cache.pop(bucket_name, None)
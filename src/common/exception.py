@@ -1,7 +1,6 @@
 from typing import Union
 from fastapi import FastAPI, HTTPException, Request, status
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 
 from .error_codes import SfsErrorCodes
@@ -31,26 +30,21 @@ class CustomHTTPException(HTTPException):
         self.error_message = error_message
         super().__init__(status_code=status_code, detail=error_message)
 
-    def to_json_response(self) -> JSONResponse:
+    def to_json_response(self) -> ORJSONResponse:
         """
-        Convert the exception to a JSONResponse.
+        Convert the exception to an ORJSONResponse.
 
         :return: Response containing the custom error code and message.
-        :rtype: JSONResponse
+        :rtype: ORJSONResponse
         """
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=self.status_code,
-            content=jsonable_encoder(
-                {
-                    "error_code": self.error_code,
-                    "error_message": self.error_message,
-                }
-            ),
+            content={"error_code": self.error_code, "error_message": self.error_message},
         )
 
 
-async def custom_exception_handler(request: Request, exc: Union[CustomHTTPException, Exception]) -> JSONResponse:
+async def custom_exception_handler(request: Request, exc: Union[CustomHTTPException, Exception]) -> ORJSONResponse:
     """
     Custom exception handler for handling custom exceptions.
 
@@ -58,14 +52,14 @@ async def custom_exception_handler(request: Request, exc: Union[CustomHTTPExcept
     :type request: Request
     :param exc: Custom exception object.
     :type exc: CustomHTTPException
-    :return: JSONResponse containing the custom error code and message.
-    :rtype: JSONResponse
+    :return: ORJSONResponse containing the custom error code and message.
+    :rtype: ORJSONResponse
     """
 
     return exc.to_json_response()
 
 
-async def internal_server_error_handler(request: Request, exc: Exception) -> JSONResponse:
+async def internal_server_error_handler(request: Request, exc: Exception) -> ORJSONResponse:
     """
     Exception handler for handling internal server errors.
 
@@ -73,48 +67,33 @@ async def internal_server_error_handler(request: Request, exc: Exception) -> JSO
     :type request: Request
     :param exc: Exception object.
     :type exc: Exception
-    :return: JSONResponse containing the error code and message.
-    :rtype: JSONResponse
+    :return: ORJSONResponse containing the error code and message.
+    :rtype: ORJSONResponse
     """
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content=jsonable_encoder(
-            {
-                "error_code": SfsErrorCodes.INTERNAL_SERVER_ERROR,
-                "error_message": str(exc),
-            }
-        ),
+        content={"error_code": SfsErrorCodes.INTERNAL_SERVER_ERROR, "error_message": str(exc)},
     )
 
 
-async def bad_request_error_handler(request: Request, exc: Union[RequestValidationError, Exception]) -> JSONResponse:
+async def bad_request_error_handler(request: Request, exc: Union[RequestValidationError, Exception]) -> ORJSONResponse:
     """
     Exception handler for handling bad request errors.
-    :param request:
-    :type request:
-    :param exc:
-    :type exc:
-    :return:
-    :rtype:
-    """
 
-    def _format_error(err):
-        return {
-            "field": err["loc"][-1],
-            "message": err.get("msg", ""),
-        }
+    :param request: Request object.
+    :type request: Request
+    :param exc: Validation exception object.
+    :type exc: RequestValidationError
+    :return: ORJSONResponse containing the error code and the list of invalid fields.
+    :rtype: ORJSONResponse
+    """
 
-    errors = [_format_error(err) for err in exc.errors()]
+    errors = [{"field": err["loc"][-1], "message": err.get("msg", "")} for err in exc.errors()]
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content=jsonable_encoder(
-            {
-                "code_error": SfsErrorCodes.REQUEST_VALIDATION_ERROR,
-                "message_error": str(errors),
-            }
-        ),
+        content={"error_code": SfsErrorCodes.REQUEST_VALIDATION_ERROR, "errors": errors},
     )
 
 
@@ -1,7 +1,7 @@
 import re
 import secrets
-from datetime import datetime
-from urllib import parse
+import time
+from functools import lru_cache
 
 from fastapi_pagination import Page
 from fastapi_pagination.customization import CustomizedPage, UseOptionalParams
@@ -13,6 +13,8 @@ from src.common.exception import CustomHTTPException
 
 disable_installed_extensions_check()
 
+_BUCKET_NAME_RE = re.compile(r"^[a-z0-9][a-z0-9.-]*[a-z0-9]$")
+
 
 def customize_page(model):
     """
@@ -46,17 +48,9 @@ def customize_page(model):
     return CustomizedPage[Page[model], UseOptionalParams()]
 
 
-def replace_minio_url_base(domain: str, url: str) -> str:
-    """
-    Replace the Minio URL base with the provided domain
-
-    :param domain: The domain to replace the Minio URL base
-    :param url: The URL to replace the Minio URL base
-    """
-
-    new_url = parse.urlparse(url)
-    domain = new_url._replace(netloc=domain)
-    return domain.geturl()
+@lru_cache(maxsize=1024)
+def _bucket_is_valid(bucket_name: str) -> bool:
+    return 3 <= len(bucket_name) <= 63 and _BUCKET_NAME_RE.match(bucket_name) is not None
 
 
 def format_bucket(bucket_name: str) -> str:
@@ -69,7 +63,7 @@ def format_bucket(bucket_name: str) -> str:
     """
 
     formatted = bucket_name.lower()[:63]
-    if not re.match(pattern=r"^[a-z0-9][a-z0-9.-]*[a-z0-9]$", string=formatted):
+    if not _bucket_is_valid(formatted):
         raise CustomHTTPException(
             error_code=SfsErrorCodes.SFS_INVALID_NAME,
             error_message=f"Invalid bucket name {formatted}."
@@ -81,9 +75,9 @@ def format_bucket(bucket_name: str) -> str:
     return formatted
 
 
-async def generate_media_name(extension: str) -> str:
+def generate_media_name(extension: str) -> str:
     """
-    Generates a unique media_router file name using the current timestamp, a UUID, and the provided file extension.
+    Generates a unique media_router file name using a random token, the current timestamp and the provided file extension.
 
     :param extension: The file extension (e.g., 'jpg', 'png').
     :type extension: str
@@ -91,6 +85,6 @@ async def generate_media_name(extension: str) -> str:
     :rtype: str
     """
 
-    timestamp, unique_id = datetime.now().strftime("%Y%m%d%H%M%S"), secrets.token_hex(nbytes=10)
-    result = f"{unique_id}-{timestamp}.{extension.lower()}"
-    return result
+    timestamp, unique_id = time.strftime("%Y%m%d%H%M%S"), secrets.token_urlsafe(15)
+    extension = extension.lower()
+    return f"{unique_id}-{timestamp}.{extension}"
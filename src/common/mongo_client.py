@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Optional
 
@@ -5,6 +6,8 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo.server_api import ServerApi
 
 _mongoclient: Optional[AsyncIOMotorClient] = None
+_mongoclient_lock = asyncio.Lock()
+_POOL_OPTIONS = {"maxPoolSize": 100, "minPoolSize": 10, "maxIdleTimeMS": 30_000, "waitQueueTimeoutMS": 2_500}
 logging.basicConfig(format="%(message)s", level=logging.INFO)
 _log = logging.getLogger(__name__)
 
@@ -18,12 +21,28 @@ async def config_mongodb_client(mongodb_uri: str) -> AsyncIOMotorClient:
 
     global _mongoclient
 
-    if _mongoclient is None or _mongoclient.closed is True:
-        _mongoclient = AsyncIOMotorClient(mongodb_uri, server_api=ServerApi("1"))
-        try:
-            await _mongoclient.admin.command("ping")
-            _log.info("Pinged your deployment. You successfully connected to MongoDB")
-        except Exception as e:
-            _log.debug(f"Failed to connect to MongoDB: {e}")
-            _mongoclient = _mongoclient
+    async with _mongoclient_lock:
+        if _mongoclient is None:
+            client = AsyncIOMotorClient(mongodb_uri, server_api=ServerApi("1"), **_POOL_OPTIONS)
+            try:
+                await client.admin.command("ping")
+                _log.info("Pinged your deployment. You successfully connected to MongoDB")
+            except Exception as e:
+                _log.error(f"Failed to connect to MongoDB: {e}")
+                client.close()
+                raise
+            _mongoclient = client
     return _mongoclient
+
+
+async def close_mongodb_client() -> None:
+    """
+    Close the shared mongodb client so the next config_mongodb_client call reconnects
+    """
+
+    global _mongoclient
+
+    async with _mongoclient_lock:
+        if _mongoclient is not None:
+            _mongoclient.close()
+            _mongoclient = None
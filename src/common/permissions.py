@@ -1,47 +1,88 @@
-from typing import Set
+import asyncio
+import hashlib
+import time
+from typing import Optional, Set
 from urllib.parse import urlencode, urljoin
 
 import httpx
-from fastapi import Header, status
+from fastapi import Header, Request, status
 
 from src.config import settings
 from .error_codes import SfsErrorCodes
 from .exception import CustomHTTPException
 
+_ACCESS_CACHE_MAXSIZE = 10_000
+
+# (permissions, token digest) -> (expiration time, access)
+_access_cache: dict[tuple[frozenset, bytes], tuple[float, bool]] = {}
+# (permissions, token digest) -> auth service call in flight, awaited by every concurrent request for that key
+_access_pending: dict[tuple[frozenset, bytes], asyncio.Task] = {}
+
+
+def _get_cached_access(key: tuple[frozenset, bytes]) -> Optional[bool]:
+    if (entry := _access_cache.get(key)) and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _set_cached_access(key: tuple[frozenset, bytes], access: bool) -> None:
+    if len(_access_cache) >= _ACCESS_CACHE_MAXSIZE:
+        # dicts keep insertion order: evict the oldest entry
+        _access_cache.pop(next(iter(_access_cache)))
+    _access_cache[key] = (time.monotonic() + settings.API_AUTH_CACHE_TTL, access)
+
 
 class CheckAccessAllow:
     """
     This class is used to check if a user has the necessary permissions to access a resource.
+
+    Answers of the auth service are cached for API_AUTH_CACHE_TTL seconds per (permissions, token) pair.
+    Tokens are only kept as a hash.
     """
 
     def __init__(self, permissions: Set, raise_exception: bool = True):
         self.url = urljoin(settings.API_AUTH_URL_BASE, settings.API_AUTH_CHECK_ACCESS_ENDPOINT)
         self.permissions = permissions
         self.raise_exception = raise_exception
+        self._permissions_key = frozenset(permissions)
+        self._check_url = f"{self.url}?{urlencode([('permission', item) for item in permissions])}"
+
+    async def __call__(self, request: Request, authorization: str = Header(...)):
+        key = (self._permissions_key, hashlib.blake2b(authorization.encode(), digest_size=16).digest())
+
+        if (access := _get_cached_access(key)) is None:
+            # only one request per key reaches the auth service, the others await the same call
+            if (pending := _access_pending.get(key)) is None:
+                pending = asyncio.ensure_future(self._fetch_access(request.app.http_client, key, authorization))
+                _access_pending[key] = pending
+                pending.add_done_callback(lambda _: _access_pending.pop(key, None))
+            # a cancelled caller must not cancel the call the other callers are waiting on
+            access = await asyncio.shield(pending)
+
+        if access is False and self.raise_exception:
+            raise CustomHTTPException(
+                error_code=SfsErrorCodes.AUTH_ACCESS_DENIED,
+                error_message="Access denied",
+                status_code=status.HTTP_403_FORBIDDEN,
+            )
+
+        return access
+
+    async def _fetch_access(self, client: httpx.AsyncClient, key: tuple[frozenset, bytes], authorization: str) -> bool:
+        response = await client.get(self._check_url, headers={"Authorization": authorization})
+        if response.is_success is False:
+            return False
+
+        access = response.json()["access"]
+        _set_cached_access(key, access)
+        return access
+
+
+def config_http_client() -> httpx.AsyncClient:
+    """
+    Create the HTTP client used to reach the auth service.
+
+    The client is created once at application startup so its connection pool is reused across requests.
+    """
 
-    async def __call__(self, authorization: str = Header(...)):
-        headers = {"Authorization": authorization}
-        query_params = urlencode([("permission", item) for item in self.permissions])
-        url = f"{self.url}?{query_params}"
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-
-            if response.is_success is False:
-                if self.raise_exception:
-                    raise CustomHTTPException(
-                        error_code=SfsErrorCodes.AUTH_ACCESS_DENIED,
-                        error_message="Access denied",
-                        status_code=status.HTTP_403_FORBIDDEN,
-                    )
-                return False
-
-            access = response.json()["access"]
-            if access is False and self.raise_exception:
-                raise CustomHTTPException(
-                    error_code=SfsErrorCodes.AUTH_ACCESS_DENIED,
-                    error_message="Access denied",
-                    status_code=status.HTTP_403_FORBIDDEN,
-                )
-
-            return access
+    return httpx.AsyncClient(limits=httpx.Limits(max_connections=100, max_keepalive_connections=50))
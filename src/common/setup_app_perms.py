@@ -1,12 +1,47 @@
+import asyncio
+import copy
 import os.path
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 
 import yaml
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
 from slugify import slugify
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 BASE_DIR = Path(__file__).parent.parent.parent
 
+_YAML_CACHE_MAXSIZE = 100
+
+# file path -> (mtime, size, parsed content)
+_yaml_cache: OrderedDict[str, tuple[int, int, list]] = OrderedDict()
+
+# (database, collection) pairs whose 'app' index was already created by this process
+_indexed: set[tuple[str, str]] = set()
+
+_PERM_CODE_PATTERN = r"[^a-zA-Z0-9:]+"
+
+
+@lru_cache(maxsize=1024)
+def _slug_code(code: str) -> str:
+    # slugify transliterates non-ASCII characters, the same codes are slugged again on every load
+    return slugify(code, regex_pattern=_PERM_CODE_PATTERN)
+
+
+def _format_permissions(permissions: list[dict]) -> list[dict]:
+    slug = _slug_code  # local binding, skips the global lookup per item
+    return [{"code": slug(item["code"]), "desc": item["desc"]} for item in permissions]
+
+
+@lru_cache(maxsize=128)
+def _slug_app(appname: str) -> str:
+    return slugify(appname)
+
 
 async def __init_collection(client: AsyncIOMotorClient, collection_path: str) -> AsyncIOMotorCollection:
     """
@@ -23,91 +58,91 @@ async def __init_collection(client: AsyncIOMotorClient, collection_path: str) ->
     database = client[database_name]
     collection = database[collection_name]
 
-    await collection.create_index("app", unique=True, background=True)
+    if (key := (database_name, collection_name)) not in _indexed:
+        await collection.create_index("app", unique=True, background=True)
+        _indexed.add(key)
 
     return collection
 
 
-async def __load_app_description(filpath) -> dict:
+def __load_app_description(filpath) -> dict:
     """
     Load the app description from a JSON file.
 
+    The parsed content is cached and reused as long as the file modification time and size are unchanged.
+
     :param filpath: Path to the JSON file.
     :rtype filpath: str
     :return: App description.
     :rtype: dict
     """
 
-    if os.path.exists(filpath) is False:
-        raise ValueError("App description file not found.")
+    try:
+        stat = os.stat(filpath)
+    except FileNotFoundError as exc:
+        raise ValueError("App description file not found.") from exc
 
-    with open(filpath, "r") as f:
-        data = yaml.safe_load(f)
+    key = str(filpath)
+    cached = _yaml_cache.get(key)
+    if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+        with open(filpath, "rb") as f:
+            cached = (stat.st_mtime_ns, stat.st_size, yaml.load(f, Loader=SafeLoader))
+        _yaml_cache[key] = cached
+        if len(_yaml_cache) > _YAML_CACHE_MAXSIZE:
+            _yaml_cache.popitem(last=False)
+    _yaml_cache.move_to_end(key)
 
-    return data
+    return copy.deepcopy(cached[2])
 
 
-async def load_app_description(
-    mongodb_client: AsyncIOMotorClient,
-    collection_path: str = None,
-    filename: str = "appdesc.yml",
-):
-    """
-    Load the app description from a JSON file and update the database.
+def __load_app_section(filename: str) -> tuple[Path, dict, str]:
     """
+    Parse the app description file once and return its 'app' section with the validated app name.
 
-    if not (coll_path := collection_path or os.environ.get("APP_DESC_DB_COLLECTION")):
-        raise ValueError("Invalid collection path")
-
-    coll = await __init_collection(mongodb_client, coll_path)
+    :param filename: Name of the file relative to the project root.
+    :rtype filename: str
+    :return: File path, 'app' section and app name.
+    :rtype: tuple[Path, dict, str]
+    """
 
     filepath = BASE_DIR / f"{filename}"
-    data = await __load_app_description(filepath)
+    data = __load_app_description(filepath)
+    app = data[0].get("app", {})
 
-    if not (appname := data[0].get("app", {}).get("name", "").strip()):
+    if not (appname := app.get("name", "").strip()):
         raise ValueError(f"App name '{appname}' not found in {filepath}")
 
-    if not (title := data[0].get("app", {}).get("title", {})):
-        raise ValueError(f"title section for app '{appname}' not found in {filepath}")
+    return filepath, app, appname
 
-    await coll.update_one(
-        {"app": slugify(appname)},
-        {"$set": {"title": title}},
-        upsert=True,
-    )
 
-
-async def load_app_permissions(
+async def load_app_metadata(
     mongodb_client: AsyncIOMotorClient,
-    collection_path: str = None,
+    description_collection_path: str = None,
+    permissions_collection_path: str = None,
     filename: str = "appdesc.yml",
 ):
     """
-    Load the app permissions from a JSON file and update the database.
+    Load the app description and permissions from a JSON file and update the database.
+
+    The file is parsed once and a single upsert is sent per collection, so only one when both paths are the same.
     """
 
-    if not (coll_path := collection_path or os.environ.get("PERMS_DB_COLLECTION")):
+    desc_coll_path = description_collection_path or os.environ.get("APP_DESC_DB_COLLECTION")
+    perms_coll_path = permissions_collection_path or os.environ.get("PERMS_DB_COLLECTION")
+    if not (desc_coll_path and perms_coll_path):
         raise ValueError("Invalid collection path")
 
-    coll = await __init_collection(mongodb_client, coll_path)
+    filepath, app, appname = __load_app_section(filename)
 
-    filepath = BASE_DIR / f"{filename}"
-    data = await __load_app_description(filepath)
+    if not (title := app.get("title", {})):
+        raise ValueError(f"title section for app '{appname}' not found in {filepath}")
 
-    if not (appname := data[0].get("app", {}).get("name", "").strip()):
-        raise ValueError(f"App name '{appname}' not found in {filepath}")
+    updates = {desc_coll_path: {"title": title}}
+    if permissions := app.get("permissions", []):
+        updates.setdefault(perms_coll_path, {})["permissions"] = _format_permissions(permissions)
+
+    async def _upsert(coll_path: str, fields: dict):
+        coll = await __init_collection(mongodb_client, coll_path)
+        await coll.update_one({"app": _slug_app(appname)}, {"$set": fields}, upsert=True)
 
-    if not (permissions := data[0].get("app", {}).get("permissions", [])):
-        return
-
-    await coll.update_one(
-        {"app": slugify(appname)},
-        {
-            "$set": {
-                "permissions": [
-                    {"code": slugify(item["code"], regex_pattern=r"[^a-zA-Z0-9:]+"), "desc": item["desc"]} for item in permissions
-                ]
-            }
-        },
-        upsert=True,
-    )
+    await asyncio.gather(*(_upsert(coll_path, fields) for coll_path, fields in updates.items()))
@@ -1,12 +1,18 @@
-import json
 from enum import StrEnum
 
+import orjson
+from pymongo import ASCENDING, DESCENDING
+
 
 class SortEnum(StrEnum):
     ASC = "asc"
     DESC = "desc"
 
 
+# sort order -> ready-made beanie sort on the creation date
+CREATED_AT_SORT = {SortEnum.ASC: [("created_at", ASCENDING)], SortEnum.DESC: [("created_at", DESCENDING)]}
+
+
 BUCKET_POLICY_CONFIG = {
     "Version": "2012-10-17",
     "Statement": [
@@ -14,4 +20,5 @@ BUCKET_POLICY_CONFIG = {
     ],
 }
 
-policy_document = json.dumps(BUCKET_POLICY_CONFIG)
+# serialized once at import, the policy never changes at runtime
+policy_document = orjson.dumps(BUCKET_POLICY_CONFIG).decode()
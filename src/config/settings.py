@@ -1,17 +1,26 @@
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from typing import Optional
 
-from pydantic import Field
-from pydantic_settings import BaseSettings
+from pydantic import computed_field, Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class SfsBaseSettings(BaseSettings):
+    # loaded once and shared by the whole process, nothing may change it afterwards
+    model_config = SettingsConfigDict(frozen=True)
+
     # APP SETTINGS
     APP_NAME: Optional[str] = Field(default="sfs", alias="APP_NAME", description="Name of the application")
-    APP_RELOAD: Optional[bool] = Field(default=True, alias="APP_RELOAD", description="Reload the server on changes")
+    APP_RELOAD: Optional[bool] = Field(default=False, alias="APP_RELOAD", description="Reload the server on changes")
     APP_LOOP: Optional[str] = Field(
         default="uvloop", alias="APP_LOOP", description="Type of loop to use: none, auto, asyncio or uvloop"
     )
+    APP_HTTP: Optional[str] = Field(
+        default="httptools", alias="APP_HTTP", description="HTTP protocol implementation to use: auto, h11 or httptools"
+    )
+    APP_WORKERS: Optional[int] = Field(
+        default=None, alias="APP_WORKERS", description="Number of worker processes, defaults to the number of CPUs"
+    )
     APP_LOG_LEVEL: Optional[str] = Field(
         default="info", alias="APP_LOG_LEVEL", description="Log level to use: debug, info, warning, error, critical"
     )
@@ -30,6 +39,16 @@ class SfsBaseSettings(BaseSettings):
     MEDIA_DB_COLLECTION: str = Field(..., alias="MEDIA_DB_COLLECTION")
     BUCKET_DB_COLLECTION: str = Field(..., alias="BUCKET_DB_COLLECTION")
 
+    @computed_field
+    @cached_property
+    def MEDIA_DB_PARTS(self) -> tuple[str, str]:
+        return tuple(self.MEDIA_DB_COLLECTION.split(".", 1))
+
+    @computed_field
+    @cached_property
+    def BUCKET_DB_PARTS(self) -> tuple[str, str]:
+        return tuple(self.BUCKET_DB_COLLECTION.split(".", 1))
+
     # STORAGE SETTINGS
     STORAGE_HOST: str = Field(..., alias="STORAGE_HOST")
     STORAGE_API_PORT: int = Field(..., alias="STORAGE_API_PORT")
@@ -40,10 +59,44 @@ class SfsBaseSettings(BaseSettings):
     STORAGE_ROOT_PASSWORD: str = Field(..., alias="STORAGE_ROOT_PASSWORD")
     STORAGE_BROWSER_REDIRECT_URL: str = Field(..., alias="STORAGE_BROWSER_REDIRECT_URL")
     STORAGE_REGION_NAME: Optional[str] = Field(default="af-south-1", alias="STORAGE_REGION_NAME")
+    STORAGE_MAX_POOL_CONNECTIONS: int = Field(
+        default=64, alias="STORAGE_MAX_POOL_CONNECTIONS", description="Minimum number of connections kept in the S3 pool"
+    )
+    STORAGE_BUCKET_CACHE_TTL: int = Field(
+        default=60, alias="STORAGE_BUCKET_CACHE_TTL", description="Seconds a successful bucket existence check is cached"
+    )
+    STORAGE_MAX_CONCURRENT_UPLOADS: int = Field(
+        default=8, alias="STORAGE_MAX_CONCURRENT_UPLOADS", description="Maximum number of uploads sent to storage at once"
+    )
+    STORAGE_MULTIPART_CHUNK_SIZE: int = Field(
+        default=16, alias="STORAGE_MULTIPART_CHUNK_SIZE", description="Size in MiB of a multipart upload part and its threshold"
+    )
+    STORAGE_TRANSFER_CONCURRENCY: int = Field(
+        default=25, alias="STORAGE_TRANSFER_CONCURRENCY", description="Maximum number of parts of one upload sent at once"
+    )
+
+    @computed_field
+    @cached_property
+    def STORAGE_POOL_CONNECTIONS(self) -> int:
+        # every part of every concurrent upload holds its own connection while it is sent
+        transfer_threads = self.STORAGE_TRANSFER_CONCURRENCY * self.STORAGE_MAX_CONCURRENT_UPLOADS
+        return max(self.STORAGE_MAX_POOL_CONNECTIONS, transfer_threads)
+
+    STORAGE_PUBLIC_REDIRECT: bool = Field(
+        default=False,
+        alias="STORAGE_PUBLIC_REDIRECT",
+        description="Redirect public media requests to a presigned storage URL instead of proxying the bytes",
+    )
+    STORAGE_PRESIGNED_URL_TTL: int = Field(
+        default=3600, alias="STORAGE_PRESIGNED_URL_TTL", description="Seconds a presigned public media URL stays valid"
+    )
 
     # AUTH ENDPOINT CONFIG
     API_AUTH_URL_BASE: str = Field(..., alias="API_AUTH_URL_BASE")
     API_AUTH_CHECK_ACCESS_ENDPOINT: str = Field(..., alias="API_AUTH_CHECK_ACCESS_ENDPOINT")
+    API_AUTH_CACHE_TTL: int = Field(
+        default=30, alias="API_AUTH_CACHE_TTL", description="Seconds an access check answer is cached"
+    )
 
 
 @lru_cache()
@@ -1,14 +1,16 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.responses import RedirectResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse
 from fastapi_pagination import add_pagination
 from slugify import slugify
 
 from src.config import settings
 from src.config.database import shutdown_db_client, startup_db_client
+from src.common.boto_client import config_boto_client
 from src.routers import bucket_router, media_router
 from src.common.exception import setup_exception_handlers
-from src.common.setup_app_perms import load_app_description, load_app_permissions
+from src.common.permissions import config_http_client
+from src.common.setup_app_perms import load_app_metadata
 
 from src.models import Bucket, Media
 
@@ -18,18 +20,21 @@ slugify_app_name = slugify(settings.APP_NAME)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await startup_db_client(app=app, models=[Bucket, Media])
+    app.boto_client = config_boto_client()
+    app.http_client = config_http_client()
 
-    await load_app_description(mongodb_client=app.mongo_db_client)
-    await load_app_permissions(mongodb_client=app.mongo_db_client)
+    await load_app_metadata(mongodb_client=app.mongo_db_client)
 
     yield
 
+    await app.http_client.aclose()
     await shutdown_db_client(app=app)
 
 
 app: FastAPI = FastAPI(
     lifespan=lifespan,
     title=settings.APP_TITLE,
+    default_response_class=ORJSONResponse,
     docs_url="/sfs/docs",
     redoc_url="/sfs/redoc",
     openapi_url="/sfs/openapi.json",
@@ -2,6 +2,7 @@ from typing import Optional
 
 from beanie import Document
 from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 from src.config import settings
 from src.schemas import BucketSchema
@@ -12,5 +13,15 @@ class Bucket(Document, BucketSchema, DatetimeTimestamp):
     bucket_slug: Optional[str] = Field(None, description="Bucket slug validated for minio")
 
     class Settings:
-        name = settings.BUCKET_DB_COLLECTION.split(".")[1]
+        name = settings.BUCKET_DB_PARTS[1]
         use_state_management = True
+        indexes = [
+            IndexModel([("bucket_name", ASCENDING), ("created_at", DESCENDING)], name="bucket_name_created_at_index"),
+            IndexModel(
+                [("bucket_slug", ASCENDING)],
+                unique=True,
+                # documents created without a slug must not collide on null
+                partialFilterExpression={"bucket_slug": {"$type": "string"}},
+                name="bucket_slug_index",
+            ),
+        ]
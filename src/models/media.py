@@ -1,31 +1,40 @@
+from datetime import datetime, timedelta
+from typing import Optional
 from urllib.parse import urljoin
 
-from beanie import Document
+from beanie import before_event, Document, Insert, Replace, Save, SaveChanges
 from pydantic import computed_field, Field
-from pymongo import ASCENDING, IndexModel
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 from src.config import settings
 from src.schemas import MediaSchema
 from .mixins import DatetimeTimestamp
 
+_PUBLIC_MEDIA_PREFIX = urljoin(settings.STORAGE_BROWSER_REDIRECT_URL, "/media/public/")
+_PRIVATE_MEDIA_PREFIX = urljoin(settings.STORAGE_BROWSER_REDIRECT_URL, "/media/")
+
 
 class Media(Document, MediaSchema, DatetimeTimestamp):
     url: str = Field(..., description="Media URL")
+    expires_at: Optional[datetime] = Field(None, description="Expiration date of a media with a time to live")
 
     class Settings:
-        name = settings.MEDIA_DB_COLLECTION.split(".")[1]
+        name = settings.MEDIA_DB_PARTS[1]
         indexes = [
             IndexModel(
                 [("bucket_name", ASCENDING), ("name_in_minio", ASCENDING)],
                 unique=True,
                 name="bucket_name_name_in_minio_index",
-            )
+            ),
+            IndexModel([("bucket_name", ASCENDING), ("created_at", DESCENDING)], name="bucket_name_created_at_index"),
         ]
 
+    @before_event(Insert, Replace, Save, SaveChanges)
+    def set_expiration(self):
+        # stored on every write so public lookups compare a plain field instead of computing it per document
+        self.expires_at = None if self.ttl_minutes is None else self.updated_at + timedelta(minutes=self.ttl_minutes)
+
     @computed_field
     def media_url(self) -> str:
-        file_path = f"{self.bucket_name}/{self.name_in_minio}"
-        if self.is_public:
-            return urljoin(settings.STORAGE_BROWSER_REDIRECT_URL, f"/media/public/{file_path}")
-        else:
-            return urljoin(settings.STORAGE_BROWSER_REDIRECT_URL, f"/media/{file_path}")
+        prefix = _PUBLIC_MEDIA_PREFIX if self.is_public else _PRIVATE_MEDIA_PREFIX
+        return f"{prefix}{self.bucket_name}/{self.name_in_minio}"
@@ -1,8 +1,21 @@
-from datetime import datetime
+from datetime import datetime, UTC
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+
+def _now() -> datetime:
+    return datetime.now(UTC)
 
 
 class DatetimeTimestamp(BaseModel):
-    created_at: datetime = Field(default_factory=datetime.now, description="Creation date")
-    updated_at: datetime = Field(default_factory=datetime.now, title="Update date")
+    created_at: datetime = Field(default_factory=_now, description="Creation date")
+    updated_at: datetime = Field(default_factory=_now, title="Update date")
+
+    @model_validator(mode="before")
+    @classmethod
+    def stamp_timestamps(cls, data):
+        # read the clock once so both fields share the same instant
+        if isinstance(data, dict) and ("created_at" not in data or "updated_at" not in data):
+            now = _now()
+            data = {"created_at": now, "updated_at": now, **data}
+        return data
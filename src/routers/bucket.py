@@ -1,15 +1,15 @@
+import re
 from typing import Optional
 
 import boto3
 from fastapi import APIRouter, Body, Depends, Query, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi_pagination.ext.beanie import paginate
-from pymongo import ASCENDING, DESCENDING
 
 from src.common.boto_client import get_boto_client
-from src.common.functional import customize_page
+from src.common.functional import customize_page, format_bucket
 from src.common.permissions import CheckAccessAllow
-from src.common.utils import SortEnum
+from src.common.utils import CREATED_AT_SORT, SortEnum
 from src.models import Bucket
 from src.schemas import BucketFilter, BucketSchema
 from src.services import create_new_bucket, delete_bucket, get_or_create_bucket
@@ -46,14 +46,14 @@ async def list_buckets(
 ):
     search = {}
     if query.bucket_name:
-        search.update({"bucket_name": {"$regex": query.bucket_name, "$options": "i"}})
+        # bucket slugs are stored lowercase, so an anchored case-sensitive prefix can use bucket_slug_index
+        search.update({"bucket_slug": {"$regex": f"^{re.escape(query.bucket_name.lower())}"}})
     if query.description:
         search.update({"description": {"$regex": query.description, "$options": "i"}})
     if query.created_at:
         search.update({"created_at": query.created_at})
 
-    sorted = DESCENDING if sort == SortEnum.DESC else ASCENDING
-    buckets = Bucket.find(search, sort=[("created_at", sorted)])
+    buckets = Bucket.find(search, sort=CREATED_AT_SORT[sort])
     return await paginate(buckets)
 
 
@@ -65,7 +65,7 @@ async def list_buckets(
     status_code=status.HTTP_200_OK,
 )
 async def get_bucket(
-    bucket_name: str,
+    bucket_name: str = Depends(format_bucket),
     create_bucket_if_not_exist: bool = Query(default=False, description="Create the bucket if it doesn't exist"),
     botoclient: boto3.client = Depends(get_boto_client),
 ):
@@ -90,7 +90,7 @@ async def get_bucket(
     summary="Delete a bucket",
     status_code=status.HTTP_200_OK,
 )
-async def remove_bucket(bucket_name: str, botoclient: boto3.client = Depends(get_boto_client)):
+async def remove_bucket(bucket_name: str = Depends(format_bucket), botoclient: boto3.client = Depends(get_boto_client)):
     await delete_bucket(bucket_name, botoclient)
     response = {"message": f"Bucket '{bucket_name}' deleted successfully."}
-    return JSONResponse(content=response, status_code=status.HTTP_200_OK)
+    return ORJSONResponse(content=response, status_code=status.HTTP_200_OK)
@@ -1,24 +1,62 @@
-import json
+import re
+from datetime import datetime, timedelta, UTC
 from mimetypes import guess_type
 from typing import Optional
-from mimetypes import guess_type
 
 import boto3
-from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, Query, status, UploadFile
-from fastapi.responses import JSONResponse, StreamingResponse
-from fastapi_pagination.async_paginator import paginate as async_paginate
-from pymongo import ASCENDING, DESCENDING
+import orjson
+from fastapi import APIRouter, Depends, File, Form, Header, Query, Response, status, UploadFile
+from fastapi.responses import ORJSONResponse, RedirectResponse, StreamingResponse
+from fastapi_pagination.ext.beanie import paginate
 
 from src.common.boto_client import check_bucket_exists, get_boto_client
 from src.common.error_codes import SfsErrorCodes
-from src.common.permissions import CheckAccessAllow
 from src.common.exception import CustomHTTPException
-from src.common.functional import customize_page
+from src.common.functional import customize_page, format_bucket
 from src.common.permissions import CheckAccessAllow
-from src.common.utils import SortEnum
+from src.common.utils import CREATED_AT_SORT, SortEnum
+from src.config import settings
 from src.models import Media
 from src.schemas import MediaFilter
-from src.services import delete_media_if_exist_from_mongo, download_media, find_public_media, get_media, upload_media
+from src.services import (
+    delete_media_if_exist_from_mongo,
+    download_media,
+    find_public_media,
+    get_media,
+    upload_media,
+)
+
+_STREAM_CHUNK_SIZE = 64 * 1024
+# private: the inline route sits behind the access check, shared caches must not keep it
+_CACHE_CONTROL = "private, max-age=300"
+
+
+def _media_content_type(media: dict, filename: str) -> str:
+    """
+    Return the stored content type of a media, guessed from its filename when storage has none.
+    """
+
+    return media.get("ContentType") or guess_type(filename)[0] or "application/octet-stream"
+
+
+def _presigned_url_ttl(media: Media) -> int:
+    """
+    Return how long a presigned URL for a public media may live, never past the media's own expiration.
+    """
+
+    expires_at = media.expires_at
+    if expires_at is None and media.ttl_minutes is not None:
+        # documents written before expires_at was stored
+        expires_at = media.updated_at + timedelta(minutes=media.ttl_minutes)
+    if expires_at is None:
+        return settings.STORAGE_PRESIGNED_URL_TTL
+
+    # MongoDB hands datetimes back naive, they are stored in UTC
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=UTC)
+    remaining = int((expires_at - datetime.now(UTC)).total_seconds())
+    return max(1, min(settings.STORAGE_PRESIGNED_URL_TTL, remaining))
+
 
 media_router: APIRouter = APIRouter(
     prefix="/media",
@@ -54,8 +92,8 @@ async def upload_file_to_buckect(
     botoclient: boto3.client = Depends(get_boto_client),
 ):
     try:
-        tags_dict = json.loads(tags) if tags else {}
-    except (json.JSONDecodeError, Exception) as exc:
+        tags_dict = orjson.loads(tags) if tags else {}
+    except (orjson.JSONDecodeError, Exception) as exc:
         raise CustomHTTPException(
             error_code=SfsErrorCodes.SFS_INVALID_TAGS_FORMAT,
             error_message="Tags should  be like: \"{'key': 'value'}\" dumped. \n Error: " f"{str(exc)}",
@@ -87,8 +125,9 @@ async def list_media(
 ):
     search = {}
     if query.bucket_name:
-        check_bucket_exists(bucket_name=query.bucket_name, botoclient=botoclient)
-        search.update({"bucket_name": {"$regex": query.bucket_name, "$options": "i"}})
+        await check_bucket_exists(bucket_name=query.bucket_name, botoclient=botoclient)
+        # bucket names are lowercase, an anchored case-sensitive prefix can use the bucket_name index
+        search.update({"bucket_name": {"$regex": f"^{re.escape(query.bucket_name.lower())}"}})
     if query.filename:
         search.update({"name_in_minio": {"$regex": query.filename, "$options": "i"}})
     if query.public:
@@ -97,10 +136,8 @@ async def list_media(
         del query["tags"]
         search.update({f"tags.{k}": v for k, v in query.tags.items()})
 
-    sorted = DESCENDING if sort == SortEnum.DESC else ASCENDING
-    medias = await Media.find(search, sort=[("created_at", sorted)]).to_list()
-    media = [await get_media(filename=media.name_in_minio, bucket_name=media.bucket_name) for media in medias if media]
-    return await async_paginate(media)
+    # storage metadata is stored on each document at upload, no per-item storage call is needed
+    return await paginate(Media.find(search, sort=CREATED_AT_SORT[sort]))
 
 
 @media_router.get(
@@ -113,31 +150,33 @@ async def list_media(
     status_code=status.HTTP_200_OK,
 )
 async def get_media_obj(
-    bg: BackgroundTasks,
-    bucket_name: str,
     filename: str,
+    bucket_name: str = Depends(format_bucket),
     download: bool = Query(default=False, description="Download the file"),
+    if_none_match: Optional[str] = Header(default=None),
     botoclient: boto3.client = Depends(get_boto_client),
 ):
     if download:
-        return await download_media(bucket_name=bucket_name, filename=filename, bg=bg, botoclient=botoclient)
+        return await download_media(bucket_name=bucket_name, filename=filename, botoclient=botoclient)
     else:
-        media = await get_media(bucket_name=bucket_name, filename=filename, botoclient=botoclient)
-
-        content_type = media.get("ContentType")
-        if not content_type:
-            content_type, _ = guess_type(filename)
-            if not content_type:
-                content_type = "application/octet-stream"
-
+        media_doc, media = await get_media(
+            bucket_name=bucket_name, filename=filename, botoclient=botoclient, if_none_match=if_none_match
+        )
+        if media is None:
+            # answer with the stored entity tag, the client header may be a list or '*'
+            headers = {"Cache-Control": _CACHE_CONTROL}
+            if etag := media_doc.etag:
+                headers["ETag"] = etag
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        headers = {"Cache-Control": _CACHE_CONTROL, "Content-Disposition": f'inline; filename="{filename}"'}
+        headers.update(
+            {name: str(media[key]) for key, name in (("ContentLength", "Content-Length"), ("ETag", "ETag")) if media.get(key)}
+        )
         return StreamingResponse(
-            content=media["Body"],
-            media_type=content_type,
-            headers={
-                "Content-Length": str(media.get("ContentLength")),
-                "ETag": media.get("ETag"),
-                "Content-Disposition": f'inline; filename="{filename}"',
-            },
+            content=media["Body"].iter_chunks(chunk_size=_STREAM_CHUNK_SIZE),
+            media_type=_media_content_type(media, filename),
+            headers=headers,
         )
 
 
@@ -147,9 +186,11 @@ async def get_media_obj(
     summary="Delete a file from a bucket",
     status_code=status.HTTP_200_OK,
 )
-async def delete_file(bucket_name: str, filename: str, botoclient: boto3.client = Depends(get_boto_client)):
+async def delete_file(
+    filename: str, bucket_name: str = Depends(format_bucket), botoclient: boto3.client = Depends(get_boto_client)
+):
     await delete_media_if_exist_from_mongo(bucket_name=bucket_name, filename=filename, botoclient=botoclient)
-    return JSONResponse(status_code=status.HTTP_200_OK, content={"message": "File deleted successfully."})
+    return ORJSONResponse(status_code=status.HTTP_200_OK, content={"message": "File deleted successfully."})
 
 
 @media_router.get(
@@ -157,7 +198,9 @@ async def delete_file(bucket_name: str, filename: str, botoclient: boto3.client
     summary="Retrieve public media",
     status_code=status.HTTP_200_OK,
 )
-async def get_public_media(bucket_name: str, filename: str, botoclient: boto3.client = Depends(get_boto_client)):
+async def get_public_media(
+    filename: str, bucket_name: str = Depends(format_bucket), botoclient: boto3.client = Depends(get_boto_client)
+):
     items_found = await find_public_media(bucket_name=bucket_name, filename=filename)
 
     if not items_found:
@@ -167,9 +210,18 @@ async def get_public_media(bucket_name: str, filename: str, botoclient: boto3.cl
             status_code=status.HTTP_404_NOT_FOUND,
         )
 
+    # let the client fetch the object straight from MinIO when enabled
+    if settings.STORAGE_PUBLIC_REDIRECT:
+        url = botoclient.generate_presigned_url(
+            ClientMethod="get_object",
+            Params={"Bucket": bucket_name, "Key": filename},
+            ExpiresIn=_presigned_url_ttl(items_found),
+        )
+        return RedirectResponse(url=url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+
     # retrieve the media from MinIO and stream it
     try:
-        media = await get_media(bucket_name=bucket_name, filename=filename, botoclient=botoclient)
+        _, media = await get_media(bucket_name=bucket_name, filename=filename, botoclient=botoclient)
     except Exception as exc:
         raise CustomHTTPException(
             error_code=SfsErrorCodes.SFS_FILE_NOT_FOUND,
@@ -177,7 +229,9 @@ async def get_public_media(bucket_name: str, filename: str, botoclient: boto3.cl
             status_code=status.HTTP_404_NOT_FOUND,
         ) from exc
 
+    headers = {name: str(media[key]) for key, name in (("ContentLength", "Content-Length"), ("ETag", "ETag")) if media.get(key)}
     return StreamingResponse(
-        content=media,
-        media_type="application/octet-stream",
+        content=media["Body"].iter_chunks(chunk_size=_STREAM_CHUNK_SIZE),
+        media_type=_media_content_type(media, filename),
+        headers=headers,
     )
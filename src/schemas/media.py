@@ -10,6 +10,9 @@ class MediaSchema(BaseModel):
     tags: dict = Field(None, description="list of tags")
     is_public: Optional[bool] = Field(False, description="Is media public")
     ttl_minutes: Optional[int] = Field(None, description="Time to live in minutes")
+    content_type: Optional[str] = Field(None, description="Media content type in storage")
+    content_length: Optional[int] = Field(None, description="Media size in bytes in storage")
+    etag: Optional[str] = Field(None, description="Media ETag in storage")
 
 
 class MediaFilter(BaseModel):
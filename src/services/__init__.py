@@ -1,2 +1,9 @@
 from .bucket import create_new_bucket, get_or_create_bucket, delete_bucket  # noqa: F401
-from .media import upload_media, get_media, delete_media_if_exist_from_mongo, download_media, find_public_media  # noqa: F401
+from .media import (  # noqa: F401
+    upload_media,
+    get_media,
+    get_media_metadata,
+    delete_media_if_exist_from_mongo,
+    download_media,
+    find_public_media,
+)
@@ -1,8 +1,18 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 import boto3
 from botocore import exceptions
 from fastapi import Depends, status
-
-from src.common.boto_client import check_bucket_exists, get_boto_client
+from fastapi.concurrency import run_in_threadpool
+
+from src.common.boto_client import (
+    check_bucket_exists,
+    get_boto_client,
+    get_boto_error,
+    invalidate_bucket_cache,
+    remember_bucket_exists,
+)
 from src.common.error_codes import SfsErrorCodes
 from src.common.exception import CustomHTTPException
 from src.common.functional import format_bucket
@@ -11,6 +21,9 @@ from src.config import settings
 from src.models import Bucket, Media
 from src.schemas import BucketSchema
 
+_DELETE_BATCH_SIZE = 1000  # DeleteObjects limit
+_DELETE_WORKERS = 8
+
 
 async def create_new_bucket(bucket: BucketSchema, botoclient: boto3.client = Depends(get_boto_client)):
     """
@@ -23,26 +36,34 @@ async def create_new_bucket(bucket: BucketSchema, botoclient: boto3.client = Dep
 
     bucket_name = format_bucket(bucket.bucket_name)
     try:
-        botoclient.head_bucket(Bucket=bucket_name)
+        await run_in_threadpool(botoclient.head_bucket, Bucket=bucket_name)
         raise CustomHTTPException(
             error_code=SfsErrorCodes.SFS_BUCKET_NAME_ALREADY_EXIST,
             error_message=f"Bucket '{bucket_name}' already exists.",
             status_code=status.HTTP_400_BAD_REQUEST,
         )
-    except (exceptions.ClientError, exceptions.BotoCoreError) as exc:
-        error_code = status_code = int(exc.response["Error"]["Code"])
+    except exceptions.BotoCoreError as exc:
+        _, status_code = get_boto_error(exc, default_status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        raise CustomHTTPException(
+            error_code=SfsErrorCodes.SFS_UNKNOWN_ERROR, error_message=str(exc), status_code=status_code
+        ) from exc
+    except exceptions.ClientError as exc:
+        error_message, status_code = get_boto_error(exc)
 
-        if error_code == status.HTTP_404_NOT_FOUND:
+        if status_code == status.HTTP_404_NOT_FOUND:
             try:
-                location = {"LocationConstraint": settings.STORAGE_REGION_NAME}
-                botoclient.create_bucket(Bucket=bucket_name, CreateBucketConfiguration=location)
+                create_kwargs = {"Bucket": bucket_name}
+                # us-east-1 is the default location and S3 rejects it as an explicit constraint
+                if settings.STORAGE_REGION_NAME != "us-east-1":
+                    create_kwargs["CreateBucketConfiguration"] = {"LocationConstraint": settings.STORAGE_REGION_NAME}
+                await run_in_threadpool(botoclient.create_bucket, **create_kwargs)
 
-                botoclient.put_bucket_policy(Bucket=bucket_name, Policy=policy_document)
+                await run_in_threadpool(botoclient.put_bucket_policy, Bucket=bucket_name, Policy=policy_document)
+                remember_bucket_exists(bucket_name)
 
                 new_doc_bucket = await Bucket(bucket_slug=bucket_name, **bucket.model_dump()).create()
             except (exceptions.ClientError, exceptions.BotoCoreError) as exc:
-                error_message = exc.response.get("Error", {}).get("Message", "An error occurred")
-                status_code = exc.response.get("ResponseMetadata", {}).get("HTTPStatusCode", status.HTTP_400_BAD_REQUEST)
+                error_message, status_code = get_boto_error(exc)
                 raise CustomHTTPException(
                     error_code=SfsErrorCodes.SFS_BUCKET_NAME_ALREADY_EXIST, error_message=error_message, status_code=status_code
                 ) from exc
@@ -87,47 +108,68 @@ async def get_or_create_bucket(
         )
 
 
-async def delete_bucket(
-    bucket_name: str = list[Depends(format_bucket), Depends(check_bucket_exists)],
-    botoclient: boto3.client = Depends(get_boto_client),
-) -> None:
+def _empty_bucket(bucket_name: str, botoclient: boto3.client) -> None:
     """
-    Deletes an S3 bucket and associated records in MongoDB.
+    Remove every object of a bucket. Blocking, meant to run in the threadpool.
+
+    Batches of up to 1000 keys are deleted concurrently while the next pages are still being listed.
 
     :param bucket_name: The bucket name to delete
     :param botoclient: boto3.client object to interact with S3
     """
-    try:
-        # Retrieve all items from the bucket
-        paginator = botoclient.get_paginator("list_objects_v2")
 
-        # Prepare batch of 1000 objects for removal
-        delete_dictionary = {"Objects": [], "Quiet": True}
+    # Retrieve all items from the bucket
+    paginator = botoclient.get_paginator("list_objects_v2")
 
-        # Browse all bucket items
-        for page in paginator.paginate(Bucket=bucket_name):
-            if "Contents" in page:
-                for obj in page["Contents"]:
-                    delete_dictionary["Objects"].append({"Key": obj["Key"]})
+    with ThreadPoolExecutor(max_workers=_DELETE_WORKERS) as executor:
+        futures, batch = [], []
 
-                    # When we reach 1000 objects, we delete them
-                    if len(delete_dictionary["Objects"]) >= 1000:
-                        botoclient.delete_objects(Bucket=bucket_name, Delete=delete_dictionary)
-                        delete_dictionary["Objects"] = []
-            else:
-                break
+        # Stream only the object keys, sending each full batch of 1000 objects for removal
+        pages = paginator.paginate(Bucket=bucket_name, PaginationConfig={"PageSize": _DELETE_BATCH_SIZE})
+        for key in pages.search("Contents[].Key"):
+            if key is None:  # page without objects
+                continue
+            batch.append({"Key": key})
+            if len(batch) >= _DELETE_BATCH_SIZE:
+                futures.append(
+                    executor.submit(botoclient.delete_objects, Bucket=bucket_name, Delete={"Objects": batch, "Quiet": True})
+                )
+                batch = []
 
         # Delete remaining objects
-        if delete_dictionary["Objects"]:
-            botoclient.delete_objects(Bucket=bucket_name, Delete=delete_dictionary)
+        if batch:
+            futures.append(
+                executor.submit(botoclient.delete_objects, Bucket=bucket_name, Delete={"Objects": batch, "Quiet": True})
+            )
 
-        # Delete MongoDB bucket and records
-        botoclient.delete_bucket(Bucket=bucket_name)
-        await Media.find({"bucket_name": bucket_name}).delete_many()
-        await Bucket.find_one({"bucket_name": bucket_name}).delete()
+        # Surface the first failed batch
+        for future in futures:
+            future.result()
 
+
+async def delete_bucket(
+    bucket_name: str = list[Depends(format_bucket), Depends(check_bucket_exists)],
+    botoclient: boto3.client = Depends(get_boto_client),
+) -> None:
+    """
+    Deletes an S3 bucket and associated records in MongoDB.
+
+    :param bucket_name: The bucket name to delete
+    :param botoclient: boto3.client object to interact with S3
+    """
+    try:
+        await run_in_threadpool(_empty_bucket, bucket_name, botoclient)
+        await run_in_threadpool(botoclient.delete_bucket, Bucket=bucket_name)
     except (exceptions.ClientError, exceptions.BotoCoreError) as exc:
-        error_message = exc.response.get("Error", {}).get("Message", "An error occurred")
+        error_message, _ = get_boto_error(exc)
         raise CustomHTTPException(
             error_code=SfsErrorCodes.SFS_INVALID_NAME, error_message=error_message, status_code=status.HTTP_400_BAD_REQUEST
         ) from exc
+    finally:
+        invalidate_bucket_cache(bucket_name)
+
+    # the MongoDB records only go once the storage bucket is gone, a storage failure leaves them untouched
+    await asyncio.gather(
+        Media.find({"bucket_name": bucket_name}).delete_many(),
+        Bucket.find_one({"bucket_name": bucket_name}).delete(),
+    )
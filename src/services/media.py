@@ -1,76 +1,77 @@
-import os
-import tempfile
+import asyncio
+from contextlib import suppress
+from datetime import datetime, UTC
 from typing import Optional
-from urllib.parse import urljoin
+from urllib.parse import urlencode, urljoin
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore import exceptions
-from fastapi import BackgroundTasks, Depends, File, status, UploadFile
-from fastapi.responses import FileResponse
-from typing_extensions import deprecated
-from urllib3 import BaseHTTPResponse, HTTPResponse
+from fastapi import Depends, File, status, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
-from src.common.boto_client import get_boto_client, check_bucket_exists
+from src.common.boto_client import check_bucket_exists, get_boto_client, get_boto_error
 from src.common.error_codes import SfsErrorCodes
 from src.common.exception import CustomHTTPException
-from src.common.functional import format_bucket, generate_media_name, replace_minio_url_base
+from src.common.functional import format_bucket, generate_media_name
 from src.config import settings
 from src.models import Media
 from src.schemas import MediaSchema
 
+_MEDIA_URL_PREFIX = urljoin(settings.STORAGE_BROWSER_REDIRECT_URL, "media/")
 
-def _upload_media_to_minio(
+_METADATA_FIELDS = ("ContentType", "ContentLength", "ETag", "LastModified")
+
+# caps the transfers held in memory at once, each may buffer up to max_concurrency multipart chunks
+_upload_semaphore = asyncio.Semaphore(settings.STORAGE_MAX_CONCURRENT_UPLOADS)
+
+_MiB = 1024 * 1024
+_DOWNLOAD_CHUNK_SIZE = 1 * _MiB
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=settings.STORAGE_MULTIPART_CHUNK_SIZE * _MiB,
+    multipart_chunksize=settings.STORAGE_MULTIPART_CHUNK_SIZE * _MiB,
+    max_concurrency=settings.STORAGE_TRANSFER_CONCURRENCY,
+    io_chunksize=_MiB,
+    use_threads=True,
+)
+
+
+async def _upload_media_to_minio(
     file: UploadFile,
     key: str,
     tags: Optional[dict] = None,
     bucket_name: str = Depends(format_bucket),
     botoclient: boto3.client = Depends(get_boto_client),
 ):
-    check_bucket_exists(bucket_name, botoclient=botoclient)
-
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-        temp_file.write(file.file.read())
+    await check_bucket_exists(bucket_name, botoclient=botoclient)
 
     try:
         extra_args = {}
+        if file.content_type:
+            extra_args["ContentType"] = file.content_type
         if tags:
-            tag_set = [{"Key": key, "Value": str(value)} for key, value in tags.items()]
-            extra_args["Tagging"] = "&".join([f"{tag['Key']}:{tag['Value']}" for tag in tag_set])
-
-        response = botoclient.upload_file(Filename=temp_file.name, Bucket=bucket_name, Key=key, ExtraArgs=extra_args)
+            # S3 expects URL-encoded key=value pairs
+            extra_args["Tagging"] = urlencode({name: str(value) for name, value in tags.items()})
+
+        await file.seek(0)
+        response = await run_in_threadpool(
+            botoclient.upload_fileobj,
+            Fileobj=file.file,
+            Bucket=bucket_name,
+            Key=key,
+            ExtraArgs=extra_args,
+            Config=_TRANSFER_CONFIG,
+        )
     except (exceptions.ClientError, exceptions.BotoCoreError) as exc:
-        error_message = exc.response.get("Error", {}).get("Message", "An error occurred")
-        status_code = exc.response.get("ResponseMetadata", {}).get("HTTPStatusCode", status.HTTP_400_BAD_REQUEST)
+        error_message, status_code = get_boto_error(exc)
         raise CustomHTTPException(
             error_code=SfsErrorCodes.SFS_INVALID_NAME, error_message=error_message, status_code=status_code
         ) from exc
 
-    os.remove(temp_file.name)
-
     return response
 
 
-@deprecated("Url will not be generated by minio directly. Use _generate_media_url instead.")
-def _media_url_from_minio(
-    filename: str,
-    bucket_name: str = Depends(format_bucket),
-    redirect_url: Optional[str] = None,
-    botoclient: boto3.client = Depends(get_boto_client),
-) -> str:
-
-    try:
-        url = botoclient.generate_presigned_url(ClientMethod="get_object", Params={"Bucket": bucket_name, "Key": filename})
-    except (exceptions.ClientError, exceptions.BotoCoreError) as exc:
-        error_message = exc.response.get("Error", {}).get("Message", "An error occurred")
-        status_code = exc.response.get("ResponseMetadata", {}).get("HTTPStatusCode", status.HTTP_400_BAD_REQUEST)
-        raise CustomHTTPException(
-            error_code=SfsErrorCodes.SFS_INVALID_NAME, error_message=error_message, status_code=status_code
-        ) from exc
-
-    result = replace_minio_url_base(redirect_url, url) if redirect_url else url
-    return result
-
-
 def _generate_media_url(
     filename: str, bucket_name: str = Depends(format_bucket), botoclient: boto3.client = Depends(get_boto_client)
 ) -> str:
@@ -86,16 +87,31 @@ def _generate_media_url(
     :return str: The media URL
     :rtype str
     """
-    media_path = urljoin(settings.STORAGE_BROWSER_REDIRECT_URL, f"media/{bucket_name}/{filename}")
+    media_path = f"{_MEDIA_URL_PREFIX}{bucket_name}/{filename}"
     return media_path
 
 
 async def _save_media(media: MediaSchema, file: UploadFile, botoclient: boto3.client = Depends(get_boto_client)) -> Media:
-    _upload_media_to_minio(
-        bucket_name=media.bucket_name, file=file, tags=media.tags, key=media.name_in_minio, botoclient=botoclient
-    )
-    obj_url = _generate_media_url(bucket_name=media.bucket_name, filename=media.name_in_minio, botoclient=botoclient)
-    media = await Media(**media.model_dump(), url=obj_url).create()
+    async with _upload_semaphore:
+        await _upload_media_to_minio(
+            bucket_name=media.bucket_name, file=file, tags=media.tags, key=media.name_in_minio, botoclient=botoclient
+        )
+    try:
+        metadata = await get_media_metadata(filename=media.name_in_minio, bucket_name=media.bucket_name, botoclient=botoclient)
+        media = media.model_copy(
+            update={
+                "content_type": metadata["ContentType"] or file.content_type,
+                "content_length": metadata["ContentLength"],
+                "etag": metadata["ETag"],
+            }
+        )
+        obj_url = _generate_media_url(bucket_name=media.bucket_name, filename=media.name_in_minio, botoclient=botoclient)
+        media = await Media(**media.model_dump(), url=obj_url).create()
+    except Exception:
+        # without its document the uploaded object would be unreachable, remove it before surfacing the error
+        with suppress(exceptions.ClientError, exceptions.BotoCoreError):
+            await run_in_threadpool(botoclient.delete_object, Bucket=media.bucket_name, Key=media.name_in_minio)
+        raise
     return media
 
 
@@ -107,8 +123,14 @@ async def upload_media(
     ttl_minutes: Optional[int] = None,
     botoclient: boto3.client = Depends(get_boto_client),
 ):
-    extension = file.filename.split(".")[-1]
-    media_name = await generate_media_name(extension=extension)
+    _, dot, extension = (file.filename or "").rpartition(".")
+    if not (dot and extension):
+        raise CustomHTTPException(
+            error_code=SfsErrorCodes.SFS_INVALID_FILE,
+            error_message=f"File '{file.filename}' has no extension.",
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+    media_name = generate_media_name(extension=extension)
 
     media_schema = MediaSchema(
         bucket_name=bucket_name,
@@ -122,21 +144,57 @@ async def upload_media(
     return media
 
 
+def _etag_matches(if_none_match: str, etag: Optional[str]) -> bool:
+    """
+    Tell whether an If-None-Match header, a list of entity tags or '*', matches the stored etag.
+    """
+
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or (etag is not None and etag in tags)
+
+
 async def get_media(
-    filename: str, bucket_name: str = Depends(format_bucket), botoclient: boto3.client = Depends(get_boto_client)
-) -> HTTPResponse | BaseHTTPResponse:
+    filename: str,
+    bucket_name: str = Depends(format_bucket),
+    botoclient: boto3.client = Depends(get_boto_client),
+    if_none_match: Optional[str] = None,
+) -> tuple[Media, Optional[dict]]:
+    """
+    Return the media document and its stored object, the object is None when the client copy is still current.
+
+    :param filename: The name of the media in the bucket
+    :type filename: str
+    :param bucket_name: The name of the bucket
+    :type bucket_name: str
+    :param botoclient: The boto3 client object
+    :type botoclient: boto3.client
+    :param if_none_match: The If-None-Match header sent by the client
+    :type if_none_match: Optional[str]
+    :return: The media document and the get_object response
+    :rtype: tuple[Media, Optional[dict]]
+    """
+
     media_doc = await Media.find_one({"name_in_minio": filename, "bucket_name": bucket_name})
     if media_doc:
+        if if_none_match and _etag_matches(if_none_match, media_doc.etag):
+            # the stored etag already answers the condition, storage is not asked
+            return media_doc, None
+
+        params = {"Bucket": bucket_name, "Key": filename}
+        if if_none_match:
+            params["IfNoneMatch"] = if_none_match
         try:
-            file_data = botoclient.get_object(Bucket=bucket_name, Key=filename)
+            file_data = await run_in_threadpool(botoclient.get_object, **params)
         except (exceptions.ClientError, exceptions.BotoCoreError) as exc:
-            error_message = exc.response.get("Error", {}).get("Message", "An error occurred")
-            status_code = exc.response.get("ResponseMetadata", {}).get("HTTPStatusCode", status.HTTP_400_BAD_REQUEST)
+            error_message, status_code = get_boto_error(exc)
+            if status_code == status.HTTP_304_NOT_MODIFIED:
+                # the client copy is still current, storage sent no body
+                return media_doc, None
             raise CustomHTTPException(
                 error_code=SfsErrorCodes.SFS_INVALID_NAME, error_message=error_message, status_code=status_code
             ) from exc
 
-        return file_data
+        return media_doc, file_data
     else:
         raise CustomHTTPException(
             error_code=SfsErrorCodes.SFS_INVALID_NAME,
@@ -145,19 +203,54 @@ async def get_media(
         )
 
 
+async def get_media_metadata(
+    filename: str, bucket_name: str = Depends(format_bucket), botoclient: boto3.client = Depends(get_boto_client)
+) -> dict:
+    """
+    Return the storage metadata of a media (content type, length, ETag and last modification date).
+
+    The metadata comes from a HEAD request, the body is never fetched.
+
+    :param filename: The name of the media in the bucket
+    :type filename: str
+    :param bucket_name: The name of the bucket
+    :type bucket_name: str
+    :param botoclient: The boto3 client object
+    :type botoclient: boto3.client
+    :return: The object metadata
+    :rtype: dict
+    """
+
+    try:
+        response = await run_in_threadpool(botoclient.head_object, Bucket=bucket_name, Key=filename)
+    except (exceptions.ClientError, exceptions.BotoCoreError) as exc:
+        error_message, status_code = get_boto_error(exc)
+        raise CustomHTTPException(
+            error_code=SfsErrorCodes.SFS_INVALID_NAME, error_message=error_message, status_code=status_code
+        ) from exc
+
+    return {field: response.get(field) for field in _METADATA_FIELDS}
+
+
 async def delete_media_if_exist_from_mongo(
     filename: str, bucket_name: str = Depends(format_bucket), botoclient: boto3.client = Depends(get_boto_client)
 ) -> None:
-    if media := Media.find_one({"name_in_minio": filename, "bucket_name": bucket_name}):
-        delete_from_bucket = botoclient.delete_object(Bucket=bucket_name, Key=filename)
-        if delete_from_bucket.get("ResponseMetadata", {}).get("HTTPStatusCode") == status.HTTP_204_NO_CONTENT:
-            await media.delete()
+    if media := await Media.find_one({"name_in_minio": filename, "bucket_name": bucket_name}):
+        try:
+            await run_in_threadpool(botoclient.delete_object, Bucket=bucket_name, Key=filename)
+        except (exceptions.ClientError, exceptions.BotoCoreError) as exc:
+            error_message, status_code = get_boto_error(exc)
+            raise CustomHTTPException(
+                error_code=SfsErrorCodes.SFS_INVALID_NAME, error_message=error_message, status_code=status_code
+            ) from exc
+
+        # the document only goes once the stored object is gone, so a storage failure leaves no orphan
+        await media.delete()
 
 
 async def download_media(
     filename: str,
     bucket_name: str = Depends(format_bucket),
-    bg: BackgroundTasks = Depends(BackgroundTasks()),
     botoclient: boto3.client = Depends(get_boto_client),
 ):
     # Rechercher le média dans votre base de données
@@ -168,55 +261,52 @@ async def download_media(
 
     # Télécharger le fichier depuis MinIO
     try:
-        media_object = botoclient.get_object(Bucket=bucket_name, Key=media.name_in_minio)
+        media_object = await run_in_threadpool(botoclient.get_object, Bucket=bucket_name, Key=media.name_in_minio)
     except (exceptions.ClientError, exceptions.BotoCoreError) as exc:
-        error_message = exc.response.get("Error", {}).get("Message", "An error occurred")
-        status_code = exc.response.get("ResponseMetadata", {}).get("HTTPStatusCode", status.HTTP_400_BAD_REQUEST)
+        error_message, status_code = get_boto_error(exc)
         raise CustomHTTPException(
             error_code=SfsErrorCodes.SFS_INVALID_NAME, error_message=error_message, status_code=status_code
         ) from exc
 
-    # Créer un fichier temporaire pour stocker le contenu
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-        temp_file.write(media_object["Body"].read())
-        temp_file_path = temp_file.name
-
     # Déterminer le type de contenu
     content_type = media_object.get("ContentType", "application/octet-stream")
 
-    # Définir la fonction de nettoyage
-    bg.add_task(os.remove, temp_file_path)
-
-    # Utiliser FileResponse avec la tâche de fond
-    response = FileResponse(
-        path=temp_file_path,
-        media_type=content_type,
-        filename=media.filename,
-        headers={
-            "Content-Disposition": f"attachment; filename={media.filename}",
-        },
-        background=bg,
+    # Streamer le corps de l'objet sans passer par le disque
+    headers = {"Content-Disposition": f'attachment; filename="{media.filename}"'}
+    if (content_length := media_object.get("ContentLength")) is not None:
+        headers["Content-Length"] = str(content_length)
+
+    return StreamingResponse(
+        content=media_object["Body"].iter_chunks(chunk_size=_DOWNLOAD_CHUNK_SIZE), media_type=content_type, headers=headers
     )
 
-    return response
 
+async def find_public_media(bucket_name: str, filename: str) -> Optional[Media]:
+    """
+    Return a public media which has no time to live or whose time to live is not exceeded yet.
 
-async def find_public_media(bucket_name: str, filename: str):
-    pipeline = [
-        {"$match": {"bucket_name": bucket_name, "name_in_minio": filename, "is_public": True}},
-        {
-            "$addFields": {
-                "expiration_time": {
-                    "$cond": {
-                        "if": {"$ne": ["$ttl_minutes", None]},
-                        "then": {"$add": ["$updated_at", {"$multiply": ["$ttl_minutes", 60000]}]},  # 1mn -> ms
-                        "else": None,
-                    }
-                }
-            }
-        },
-        {"$match": {"$or": [{"expiration_time": {"$gt": datetime.now()}}, {"expiration_time": None}]}},
-    ]
+    :param bucket_name: The name of the bucket
+    :type bucket_name: str
+    :param filename: The name of the media in the bucket
+    :type filename: str
+    :return: The media document, None when missing, private or expired
+    :rtype: Optional[Media]
+    """
 
-    media_from_db = await Media.aggregate(pipeline).to_list()
-    return media_from_db
+    now = datetime.now(UTC)
+    return await Media.find_one(
+        {
+            "bucket_name": bucket_name,
+            "name_in_minio": filename,
+            "is_public": True,
+            "$or": [
+                {"ttl_minutes": None},
+                {"expires_at": {"$gt": now}},
+                # documents written before expires_at was stored
+                {
+                    "expires_at": None,
+                    "$expr": {"$gt": ["$updated_at", {"$subtract": [now, {"$multiply": ["$ttl_minutes", 60_000]}]}]},
+                },
+            ],
+        }
+    )
@@ -1,12 +1,17 @@
+from unittest import mock
+
+import pytest
+
 from src.config import settings
 
 
-async def test_get_boto_client_success(mock_boto_client):
+async def test_config_boto_client_success(mock_boto_client):
 
-    from src.common.boto_client import get_boto_client
+    from src.common.boto_client import config_boto_client
 
+    config_boto_client.cache_clear()
     mock_boto_instance = mock_boto_client.return_value
-    boto_client = get_boto_client()
+    boto_client = config_boto_client()
 
     mock_boto_client.assert_called_once()
     mock_boto_client.assert_called_once_with(
@@ -15,5 +20,61 @@ async def test_get_boto_client_success(mock_boto_client):
         aws_access_key_id=settings.STORAGE_ACCESS_KEY,
         aws_secret_access_key=settings.STORAGE_SECRET_KEY,
         region_name=settings.STORAGE_REGION_NAME,
+        config=mock.ANY,
     )
     assert boto_client is mock_boto_instance
+    pool_size = mock_boto_client.call_args.kwargs["config"].max_pool_connections
+    assert pool_size == settings.STORAGE_POOL_CONNECTIONS
+    assert pool_size >= settings.STORAGE_MAX_POOL_CONNECTIONS
+    assert pool_size >= settings.STORAGE_TRANSFER_CONCURRENCY * settings.STORAGE_MAX_CONCURRENT_UPLOADS
+
+
+def test_config_boto_client_unreachable(mock_boto_client):
+    from botocore import exceptions
+
+    from src.common.boto_client import config_boto_client
+    from src.common.exception import CustomHTTPException
+
+    config_boto_client.cache_clear()
+    mock_boto_client.return_value.list_buckets.side_effect = exceptions.EndpointConnectionError(endpoint_url="http://minio")
+
+    with pytest.raises(CustomHTTPException) as exc_info:
+        config_boto_client()
+
+    assert exc_info.value.status_code == 503
+    config_boto_client.cache_clear()
+
+
+def test_get_boto_client_returns_app_client():
+    from src.common.boto_client import get_boto_client
+
+    request = mock.Mock()
+    assert get_boto_client(request) is request.app.boto_client
+
+
+async def test_check_bucket_exists_is_cached():
+    from src.common.boto_client import check_bucket_exists, invalidate_bucket_cache
+
+    botoclient = mock.Mock()
+    invalidate_bucket_cache("unsta-cache")
+
+    assert await check_bucket_exists("unsta-cache", botoclient=botoclient) == "unsta-cache"
+    assert await check_bucket_exists("unsta-cache", botoclient=botoclient) == "unsta-cache"
+    botoclient.head_bucket.assert_called_once_with(Bucket="unsta-cache")
+
+    invalidate_bucket_cache("unsta-cache")
+    await check_bucket_exists("unsta-cache", botoclient=botoclient)
+    assert botoclient.head_bucket.call_count == 2
+
+
+def test_get_boto_error():
+    from botocore import exceptions
+
+    from src.common.boto_client import get_boto_error
+
+    client_error = exceptions.ClientError(
+        error_response={"Error": {"Code": "403", "Message": "Forbidden"}, "ResponseMetadata": {"HTTPStatusCode": 403}},
+        operation_name="GetObject",
+    )
+    assert get_boto_error(client_error) == ("Forbidden", 403)
+    assert get_boto_error(exceptions.EndpointConnectionError(endpoint_url="http://minio")) == ("An error occurred", 400)
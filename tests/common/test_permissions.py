@@ -0,0 +1,57 @@
+from unittest import mock
+
+import pytest
+from starlette import status
+
+from src.common.exception import CustomHTTPException
+from src.common.permissions import CheckAccessAllow
+
+
+def _mock_request(access: bool):
+    request = mock.Mock()
+    request.app.http_client = mock.AsyncMock()
+    request.app.http_client.get.return_value.is_success = True
+    request.app.http_client.get.return_value.json = mock.Mock(return_value={"access": access})
+    return request
+
+
+async def test_check_access_allow_is_cached(mock_check_access_allow):
+    request = _mock_request(access=True)
+    check_access = CheckAccessAllow(permissions={"sfs:can-read-cache"})
+
+    assert await check_access(request, authorization="Bearer cached") is True
+    assert await check_access(request, authorization="Bearer cached") is True
+    request.app.http_client.get.assert_called_once()
+
+    assert await check_access(request, authorization="Bearer other") is True
+    assert request.app.http_client.get.call_count == 2
+
+
+async def test_check_access_allow_denied(mock_check_access_allow):
+    request = _mock_request(access=False)
+    check_access = CheckAccessAllow(permissions={"sfs:can-read-denied"})
+
+    with pytest.raises(CustomHTTPException) as exc:
+        await check_access(request, authorization="Bearer denied")
+    assert exc.value.status_code == status.HTTP_403_FORBIDDEN
+
+
+async def test_check_access_allow_single_flight(mock_check_access_allow):
+    import asyncio
+
+    request = _mock_request(access=False)
+    request.app.http_client.get.return_value.is_success = False
+    check_access = CheckAccessAllow(permissions={"sfs:can-read-flight"}, raise_exception=False)
+
+    async def slow_get(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return request.app.http_client.get.return_value
+
+    request.app.http_client.get.side_effect = slow_get
+
+    # failed answers are not cached, every waiter still shares the single call in flight
+    assert await asyncio.gather(*(check_access(request, authorization="Bearer flight") for _ in range(5))) == [False] * 5
+    request.app.http_client.get.assert_called_once()
+
+    await check_access(request, authorization="Bearer flight")
+    assert request.app.http_client.get.call_count == 2
@@ -0,0 +1,68 @@
+from unittest import mock
+
+import yaml
+
+from src.common import setup_app_perms
+
+APP_DESCRIPTION = """
+- app:
+    name: "sfs"
+    title:
+        en: "File storage"
+    permissions:
+        - code: "sfs:can-read-file"
+          desc:
+            en: "Can read a file"
+"""
+
+
+def _load(filepath):
+    # module level dunder names are not mangled, getattr keeps it explicit
+    return getattr(setup_app_perms, "__load_app_description")(filepath)
+
+
+def test_load_app_description_is_cached(tmp_path):
+    filepath = tmp_path / "appdesc.yml"
+    filepath.write_text(APP_DESCRIPTION)
+
+    with mock.patch.object(setup_app_perms.yaml, "load", wraps=yaml.load) as mock_load:
+        first, second = _load(filepath), _load(filepath)
+
+    mock_load.assert_called_once()
+    assert first == second
+    # callers get their own copy and cannot alter the cached content
+    assert first is not second
+    first[0]["app"]["name"] = "changed"
+    assert _load(filepath)[0]["app"]["name"] == "sfs"
+
+
+def test_load_app_description_reloads_changed_file(tmp_path):
+    filepath = tmp_path / "appdesc.yml"
+    filepath.write_text(APP_DESCRIPTION)
+    assert _load(filepath)[0]["app"]["title"] == {"en": "File storage"}
+
+    filepath.write_text(APP_DESCRIPTION.replace("File storage", "Simple file storage"))
+    assert _load(filepath)[0]["app"]["title"] == {"en": "Simple file storage"}
+
+
+async def test_load_app_metadata(tmp_path, mongo_client):
+    (tmp_path / "appdesc.yml").write_text(APP_DESCRIPTION)
+
+    with mock.patch.object(setup_app_perms, "BASE_DIR", tmp_path):
+        await setup_app_perms.load_app_metadata(
+            mongo_client, description_collection_path="sfs.appdesc", permissions_collection_path="sfs.perms"
+        )
+
+    description = await mongo_client["sfs"]["appdesc"].find_one({"app": "sfs"}, {"_id": 0})
+    assert description == {"app": "sfs", "title": {"en": "File storage"}}
+
+    permissions = await mongo_client["sfs"]["perms"].find_one({"app": "sfs"}, {"_id": 0})
+    assert permissions == {"app": "sfs", "permissions": [{"code": "sfs:can-read-file", "desc": {"en": "Can read a file"}}]}
+
+
+def test_slug_code_matches_slugify():
+    from slugify import slugify
+
+    for code in ("sfs:can-read-file", "Café:Écrire Fichier", "  sfs:can_delete  bucket "):
+        assert setup_app_perms._slug_code(code) == slugify(code, regex_pattern=r"[^a-zA-Z0-9:]+")
+    assert setup_app_perms._slug_code("Café:lire") == "cafe:lire"
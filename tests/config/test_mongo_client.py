@@ -2,13 +2,16 @@ from unittest import mock
 
 import pytest
 
+from src.config import settings
 from src.config.database import shutdown_db_client, startup_db_client
 
 
-@pytest.mark.asyncio
 @mock.patch("src.config.database.init_beanie", return_value=None)
 async def test_startup_db_client(mock_init_beanie, fixture_client_mongo, mock_app_instance, fixture_models):
-    await startup_db_client(app=mock_app_instance, models=[fixture_models.Bucket, fixture_models.Media])
+    with mock.patch("src.config.database.config_mongodb_client", return_value=fixture_client_mongo) as mock_config:
+        await startup_db_client(app=mock_app_instance, models=[fixture_models.Bucket, fixture_models.Media])
+
+    mock_config.assert_awaited_once_with(settings.MONGODB_URI)
 
     assert mock_app_instance.mongo_db_client is not None
     assert fixture_client_mongo.is_mongos is True
@@ -22,8 +25,28 @@ async def test_startup_db_client(mock_init_beanie, fixture_client_mongo, mock_ap
     """
 
 
-@pytest.mark.asyncio
 async def test_shutdown_db_client(mock_app_instance):
-    mock_app_instance.mongo_db_client = mock.AsyncMock()
-    await shutdown_db_client(app=mock_app_instance)
-    mock_app_instance.mongo_db_client.close.assert_called_once()
+    from src.common import mongo_client
+
+    client = mock.Mock()
+    with mock.patch.object(mongo_client, "_mongoclient", client):
+        await shutdown_db_client(app=mock_app_instance)
+
+        client.close.assert_called_once()
+        assert mongo_client._mongoclient is None
+
+
+async def test_config_mongodb_client_raises_when_ping_fails():
+    from src.common import mongo_client
+
+    with (
+        mock.patch.object(mongo_client, "AsyncIOMotorClient") as mock_motor,
+        mock.patch.object(mongo_client, "_mongoclient", None),
+    ):
+        mock_motor.return_value.admin.command = mock.AsyncMock(side_effect=Exception("unreachable"))
+
+        with pytest.raises(Exception, match="unreachable"):
+            await mongo_client.config_mongodb_client("mongodb://unreachable")
+
+        mock_motor.return_value.close.assert_called_once()
+        assert mongo_client._mongoclient is None
@@ -2,27 +2,29 @@ from unittest import mock
 
 import pytest
 from beanie import init_beanie
-from httpx import AsyncClient
+from httpx import ASGITransport, AsyncClient
 from mongomock_motor import AsyncMongoMockClient
 
+from src.common.boto_client import _bucket_exists_cache
+from src.common.permissions import _access_cache
 from src.config import settings
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def fake_data():
     import faker
 
     return faker.Faker()
 
 
-@pytest.fixture()
-async def mock_app_instance():
+@pytest.fixture(scope="session")
+def mock_app_instance():
     from src.main import app as mock_app
 
-    yield mock_app
+    return mock_app
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def fixture_models():
     from src import models
 
@@ -35,22 +37,19 @@ async def mongo_client():
 
 
 @pytest.fixture(autouse=True)
-def mock_check_access_allow():
+def mock_check_access_allow(mock_app_instance):
     mock_response = mock.Mock()
     mock_response.is_success = True
     mock_response.json.return_value = {"access": True}
 
-    async def mock_httpx_get(*args, **kwargs):
-        return mock_response
+    mock_client = mock.AsyncMock()
+    mock_client.get.return_value = mock_response
 
-    async def mock_async_context_manager():
-        mock_client = mock.AsyncMock()
-        mock_client.get.return_value = mock_response
-        return mock_client
-
-    with mock.patch("httpx.AsyncClient") as mock_client:
-        mock_client.return_value.__aenter__.side_effect = mock_async_context_manager
-        yield mock_client
+    mock_app_instance.http_client = mock_client
+    # module level caches would otherwise leak answers from one test into the next
+    _access_cache.clear()
+    _bucket_exists_cache.clear()
+    yield mock_client.get
 
 
 @pytest.fixture(autouse=True)
@@ -74,7 +73,6 @@ def bucket_data(fake_data):
     return {"bucket_name": "unsta-storage", "description": fake_data.text()}
 
 
-@pytest.mark.asyncio
 @pytest.fixture()
 async def default_bucket(fixture_models, bucket_data):
     result = await fixture_models.Bucket(**bucket_data).create()
@@ -87,7 +85,6 @@ def media_data(fake_data):
     return {"filename": file_name, "bucket_name": "unsta-storage", "name_in_minio": file_name, "tags": {"tag": "value"}}
 
 
-@pytest.mark.asyncio
 @pytest.fixture()
 async def default_media(fixture_models, media_data, fake_data):
     url = settings.STORAGE_BROWSER_REDIRECT_URL + f"/media/{media_data['bucket_name']}/{media_data['filename']}"
@@ -101,7 +98,7 @@ async def http_client_api(mock_app_instance, fixture_client_mongo, mock_boto_cli
 
     mock_app_instance.dependency_overrides[get_boto_client] = lambda: mock_boto_client
 
-    async with AsyncClient(app=mock_app_instance, base_url="http://sfs.api") as bucket_api:
+    async with AsyncClient(transport=ASGITransport(app=mock_app_instance), base_url="http://sfs.api") as bucket_api:
         yield bucket_api
 
     mock_app_instance.dependency_overrides = {}
@@ -1,6 +1,5 @@
 from unittest import mock
 
-import pytest
 from botocore import exceptions
 from starlette import status
 
@@ -8,20 +7,19 @@ from src.common.error_codes import SfsErrorCodes
 from src.config import settings
 
 
-@pytest.mark.asyncio
 async def test_ping_api(http_client_api):
     response = await http_client_api.get("/sfs/@ping")
     assert response.status_code == status.HTTP_200_OK, response.text
     assert response.json() == {"message": "pong !"}
 
 
-@pytest.mark.asyncio
 async def test_create_bucket_success(http_client_api, mock_boto_client, default_bucket, mock_check_access_allow, bucket_data):
     bucket_data.update({"bucket_name": "storage-unsta-pictures"})
 
     # Simuler que le bucket n'existe pas en levant une exception 404
     mock_boto_client.head_bucket.side_effect = exceptions.ClientError(
-        error_response={"Error": {"Code": "404", "Message": "Not Found"}}, operation_name="HeadBucket"
+        error_response={"Error": {"Code": "404", "Message": "Not Found"}, "ResponseMetadata": {"HTTPStatusCode": 404}},
+        operation_name="HeadBucket",
     )
 
     # Simuler la création réussie du bucket
@@ -33,9 +31,7 @@ async def test_create_bucket_success(http_client_api, mock_boto_client, default_
     assert response.status_code == status.HTTP_201_CREATED, response.text
     assert response.json()["bucket_name"] == bucket_data.get("bucket_name")
 
-    mock_boto_client.head_bucket.assert_called_once()
     mock_boto_client.head_bucket.assert_called_once_with(Bucket=bucket_data.get("bucket_name"))
-    mock_boto_client.create_bucket.assert_called_once()
     mock_boto_client.create_bucket.assert_called_once_with(
         Bucket=bucket_data.get("bucket_name"), CreateBucketConfiguration={"LocationConstraint": settings.STORAGE_REGION_NAME}
     )
@@ -61,7 +57,17 @@ async def test_create_bucket_failure(http_client_api, mock_boto_client, bucket_d
     mock_check_access_allow.assert_called_once()
 
 
-@pytest.mark.asyncio
+async def test_create_bucket_storage_unreachable(http_client_api, mock_boto_client, bucket_data, mock_check_access_allow):
+    mock_boto_client.head_bucket.side_effect = exceptions.EndpointConnectionError(endpoint_url=settings.STORAGE_HOST)
+
+    response = await http_client_api.post("/buckets", json=bucket_data, headers={"Authorization": "Bearer token"})
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE, response.text
+    assert response.json()["error_code"] == SfsErrorCodes.SFS_UNKNOWN_ERROR
+
+    mock_boto_client.create_bucket.assert_not_called()
+
+
 async def test_list_bucket_with_data(http_client_api, default_bucket, mock_check_access_allow):
     response = await http_client_api.get("/buckets", headers={"Authorization": "Bearer token"})
     assert response.status_code == status.HTTP_200_OK, response.text
@@ -71,7 +77,6 @@ async def test_list_bucket_with_data(http_client_api, default_bucket, mock_check
     mock_check_access_allow.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_list_bucket_without_data(http_client_api, mock_check_access_allow):
     response = await http_client_api.get("/buckets", headers={"Authorization": "Bearer token"})
     assert response.status_code == status.HTTP_200_OK, response.text
@@ -80,8 +85,9 @@ async def test_list_bucket_without_data(http_client_api, mock_check_access_allow
     mock_check_access_allow.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_list_buckect_filter(http_client_api, default_bucket, fake_data, mock_check_access_allow):
+    await default_bucket.set({"bucket_slug": default_bucket.bucket_name})
+
     # Test filter by bucket_name
     response = await http_client_api.get(
         "/buckets", params={"bucket_name": f"{default_bucket.bucket_name}"}, headers={"Authorization": "Bearer token"}
@@ -89,6 +95,16 @@ async def test_list_buckect_filter(http_client_api, default_bucket, fake_data, m
     assert response.status_code == status.HTTP_200_OK, response.text
     assert response.json()["items"][0]["bucket_name"] == default_bucket.bucket_name
 
+    # Test filter by bucket_name prefix, case-insensitive on input
+    response = await http_client_api.get("/buckets", params={"bucket_name": "UNSTA-"}, headers={"Authorization": "Bearer token"})
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert [item["bucket_name"] for item in response.json()["items"]] == [default_bucket.bucket_name]
+
+    # bucket_name matches a prefix, not a substring
+    response = await http_client_api.get("/buckets", params={"bucket_name": "storage"}, headers={"Authorization": "Bearer token"})
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.json()["items"] == []
+
     # Test filter by description
     response = await http_client_api.get(
         "/buckets", params={"description": default_bucket.description}, headers={"Authorization": "Bearer token"}
@@ -105,11 +121,11 @@ async def test_list_buckect_filter(http_client_api, default_bucket, fake_data, m
     mock_check_access_allow.assert_called()
 
 
-@pytest.mark.asyncio
 async def test_get_bucket_and_create_bucket_if_not_exist(http_client_api, mock_boto_client, mock_check_access_allow):
     # Simuler que le bucket n'existe pas en levant une exception 404
     mock_boto_client.head_bucket.side_effect = exceptions.ClientError(
-        error_response={"Error": {"Code": "404", "Message": "Not Found"}}, operation_name="HeadBucket"
+        error_response={"Error": {"Code": "404", "Message": "Not Found"}, "ResponseMetadata": {"HTTPStatusCode": 404}},
+        operation_name="HeadBucket",
     )
 
     # Simuler la création réussie du bucket
@@ -122,9 +138,7 @@ async def test_get_bucket_and_create_bucket_if_not_exist(http_client_api, mock_b
     assert response.status_code == status.HTTP_200_OK, response.text
     assert response.json()["bucket_name"] == "unsta-pictures"
 
-    mock_boto_client.head_bucket.assert_called_once()
     mock_boto_client.head_bucket.assert_called_once_with(Bucket="unsta-pictures")
-    mock_boto_client.create_bucket.assert_called_once()
     mock_boto_client.create_bucket.assert_called_once_with(
         Bucket="unsta-pictures", CreateBucketConfiguration={"LocationConstraint": settings.STORAGE_REGION_NAME}
     )
@@ -132,7 +146,6 @@ async def test_get_bucket_and_create_bucket_if_not_exist(http_client_api, mock_b
     mock_check_access_allow.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_get_bucket_and_create_bucket_if_exist(http_client_api, mock_boto_client, default_bucket, mock_check_access_allow):
     response = await http_client_api.get(
         f"/buckets/{default_bucket.bucket_name}",
@@ -146,7 +159,6 @@ async def test_get_bucket_and_create_bucket_if_exist(http_client_api, mock_boto_
     mock_check_access_allow.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_delete_bucket(http_client_api, mock_boto_client, default_bucket, mock_check_access_allow):
     mock_boto_client.delete_bucket.return_value = mock.Mock()
 
@@ -154,7 +166,21 @@ async def test_delete_bucket(http_client_api, mock_boto_client, default_bucket,
 
     assert response.status_code == status.HTTP_200_OK, response.text
 
-    mock_boto_client.delete_bucket.assert_called_once()
     mock_boto_client.delete_bucket.assert_called_once_with(Bucket=default_bucket.bucket_name)
 
     mock_check_access_allow.assert_called_once()
+
+
+async def test_delete_bucket_storage_failure_keeps_records(
+    http_client_api, mock_boto_client, default_bucket, fixture_models, mock_check_access_allow
+):
+    mock_boto_client.delete_bucket.side_effect = exceptions.ClientError(
+        error_response={"Error": {"Code": "409", "Message": "BucketNotEmpty"}, "ResponseMetadata": {"HTTPStatusCode": 409}},
+        operation_name="DeleteBucket",
+    )
+
+    response = await http_client_api.delete(f"/buckets/{default_bucket.bucket_name}", headers={"Authorization": "Bearer token"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST, response.text
+    assert response.json()["error_code"] == SfsErrorCodes.SFS_INVALID_NAME
+
+    assert await fixture_models.Bucket.find_one({"bucket_name": default_bucket.bucket_name}) is not None
@@ -1,9 +1,11 @@
+from unittest import mock
+
 import pytest
+from botocore import exceptions
 from starlette import status
 from src.common.error_codes import SfsErrorCodes
 
 
-@pytest.mark.asyncio
 async def test_get_all_media_without_data(http_client_api, mock_check_access_allow):
     response = await http_client_api.get("/media", headers={"Authorization": "Bearer token"})
     assert response.status_code == status.HTTP_200_OK, response.text
@@ -12,8 +14,6 @@ async def test_get_all_media_without_data(http_client_api, mock_check_access_all
     mock_check_access_allow.assert_called_once()
 
 
-@pytest.mark.skip
-@pytest.mark.asyncio
 async def test_list_media_with_data(http_client_api, default_media, mock_check_access_allow):
     response = await http_client_api.get("/media", headers={"Authorization": "Bearer token"})
     assert response.status_code == status.HTTP_200_OK, response.text
@@ -23,8 +23,6 @@ async def test_list_media_with_data(http_client_api, default_media, mock_check_a
     mock_check_access_allow.assert_called_once()
 
 
-@pytest.mark.skip
-@pytest.mark.asyncio
 async def test_list_media_filter(http_client_api, default_media, fake_data, mock_check_access_allow):
     # Test filter by bucket_name
     response = await http_client_api.get(
@@ -41,40 +39,84 @@ async def test_list_media_filter(http_client_api, default_media, fake_data, mock
     mock_check_access_allow.assert_called()
 
 
-@pytest.mark.asyncio
-async def test_get_media_url(http_client_api, default_media, mock_check_access_allow):
+async def test_get_media_url(http_client_api, mock_boto_client, default_media, mock_check_access_allow):
+    body = mock.Mock()
+    body.iter_chunks.return_value = iter([b"x"])
+    mock_boto_client.get_object.return_value = {"Body": body, "ContentType": "text/plain", "ContentLength": 1, "ETag": '"etag"'}
+
     response = await http_client_api.get(
         f"/media/{default_media.bucket_name}/{default_media.filename}", headers={"Authorization": "Bearer token"}
     )
     assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.content == b"x"
 
     mock_check_access_allow.assert_called_once()
 
 
-@pytest.mark.skip
-@pytest.mark.asyncio
-async def test_get_media_url_download(http_client_api, default_media, mock_check_access_allow):
+async def test_get_media_not_modified(http_client_api, mock_boto_client, default_media, mock_check_access_allow):
+    default_media.etag = '"stored"'
+    await default_media.save()
+    mock_boto_client.get_object.side_effect = exceptions.ClientError(
+        error_response={"Error": {"Code": "304", "Message": "Not Modified"}, "ResponseMetadata": {"HTTPStatusCode": 304}},
+        operation_name="GetObject",
+    )
+
+    response = await http_client_api.get(
+        f"/media/{default_media.bucket_name}/{default_media.filename}",
+        headers={"Authorization": "Bearer token", "If-None-Match": '"etag"'},
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED, response.text
+    assert response.headers["etag"] == '"stored"'
+
+    mock_boto_client.get_object.assert_called_once_with(
+        Bucket=default_media.bucket_name, Key=default_media.filename, IfNoneMatch='"etag"'
+    )
+
+
+@pytest.mark.parametrize("if_none_match", ['"other", W/"stored"', "*"])
+async def test_get_media_not_modified_from_stored_etag(
+    http_client_api, mock_boto_client, default_media, mock_check_access_allow, if_none_match
+):
+    default_media.etag = '"stored"'
+    await default_media.save()
+
+    response = await http_client_api.get(
+        f"/media/{default_media.bucket_name}/{default_media.filename}",
+        headers={"Authorization": "Bearer token", "If-None-Match": if_none_match},
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED, response.text
+    assert response.headers["etag"] == '"stored"'
+
+    mock_boto_client.get_object.assert_not_called()
+
+
+async def test_get_media_url_download(http_client_api, mock_boto_client, default_media, mock_check_access_allow):
+    body = mock.Mock()
+    body.iter_chunks.return_value = iter([b"x"])
+    mock_boto_client.get_object.return_value = {"Body": body, "ContentType": "text/plain", "ContentLength": 1}
+
     response = await http_client_api.get(
         f"/media/{default_media.bucket_name}/{default_media.filename}",
         params={"download": True},
         headers={"Authorization": "Bearer token"},
     )
     assert response.status_code == status.HTTP_200_OK, response.text
-    assert response.json()["url"] == default_media.url
+    assert response.content == b"x"
+    assert response.headers["content-disposition"] == f'attachment; filename="{default_media.filename}"'
 
     mock_check_access_allow.assert_called_once()
 
 
-@pytest.mark.skip
-@pytest.mark.asyncio
-async def test_upload_media_success(http_client_api, default_bucket, fake_data, mock_check_access_allow):
+async def test_upload_media_success(http_client_api, mock_boto_client, default_bucket, mock_check_access_allow):
+    mock_boto_client.head_object.return_value = {"ContentType": "text/plain", "ContentLength": 1, "ETag": '"etag"'}
+
     response = await http_client_api.post(
         "/media",
         data={"bucket_name": default_bucket.bucket_name, "tags": '{"tag": "value"}'},
-        files={"file": ("test.txt", fake_data.text().encode("utf-8"))},
+        files={"file": ("test.txt", b"x")},
         headers={"Authorization": "Bearer token"},
     )
-    assert response.status_code == status.HTTP_201_CREATED, response.text
+    assert response.status_code == status.HTTP_202_ACCEPTED, response.text
     assert response.json()["bucket_name"] == default_bucket.bucket_name
     assert response.json()["tags"] == {"tag": "value"}
     assert response.json()["url"] is not None
@@ -82,12 +124,32 @@ async def test_upload_media_success(http_client_api, default_bucket, fake_data,
     mock_check_access_allow.assert_called_once()
 
 
-@pytest.mark.asyncio
-async def test_upload_media_invalid_tags(http_client_api, default_bucket, fake_data, mock_check_access_allow):
+async def test_upload_media_metadata_failure_removes_object(
+    http_client_api, mock_boto_client, default_bucket, fixture_models, mock_check_access_allow
+):
+    mock_boto_client.head_object.side_effect = exceptions.ClientError(
+        error_response={"Error": {"Code": "500", "Message": "Internal Error"}, "ResponseMetadata": {"HTTPStatusCode": 500}},
+        operation_name="HeadObject",
+    )
+
+    response = await http_client_api.post(
+        "/media",
+        data={"bucket_name": default_bucket.bucket_name, "tags": '{"tag": "value"}'},
+        files={"file": ("test.txt", b"x")},
+        headers={"Authorization": "Bearer token"},
+    )
+    assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR, response.text
+
+    key = mock_boto_client.upload_fileobj.call_args.kwargs["Key"]
+    mock_boto_client.delete_object.assert_called_once_with(Bucket=default_bucket.bucket_name, Key=key)
+    assert await fixture_models.Media.find_one({"name_in_minio": key}) is None
+
+
+async def test_upload_media_invalid_tags(http_client_api, default_bucket, mock_check_access_allow):
     response = await http_client_api.post(
         "/media",
         data={"bucket_name": default_bucket.bucket_name, "tags": "invalid"},
-        files={"file": ("test.txt", fake_data.text().encode("utf-8"))},
+        files={"file": ("test.txt", b"x")},
         headers={"Authorization": "Bearer token"},
     )
     assert response.status_code == status.HTTP_400_BAD_REQUEST, response.text
@@ -95,23 +157,39 @@ async def test_upload_media_invalid_tags(http_client_api, default_bucket, fake_d
     mock_check_access_allow.assert_called_once()
 
 
-@pytest.mark.skip
-@pytest.mark.asyncio
-async def test_upload_media_invalid_bucket_name(http_client_api, fake_data, mock_check_access_allow):
+async def test_upload_media_invalid_bucket_name(http_client_api, mock_boto_client, mock_check_access_allow):
+    mock_boto_client.head_bucket.side_effect = exceptions.ClientError(
+        error_response={"Error": {"Code": "404", "Message": "Not Found"}, "ResponseMetadata": {"HTTPStatusCode": 404}},
+        operation_name="HeadBucket",
+    )
+
     response = await http_client_api.post(
         "/media",
         data={"bucket_name": "invalid", "tags": '{"tag": "value"}'},
-        files={"file": ("test.txt", fake_data.text().encode("utf-8"))},
+        files={"file": ("test.txt", b"x")},
+        headers={"Authorization": "Bearer token"},
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND, response.text
+    assert response.json()["error_code"] == SfsErrorCodes.SFS_INVALID_NAME
+    assert response.json()["error_message"].startswith("Bucket 'invalid' does not exist.")
+
+    mock_boto_client.head_bucket.assert_called_once_with(Bucket="invalid")
+    mock_check_access_allow.assert_called_once()
+
+
+async def test_upload_media_without_extension(http_client_api, default_bucket, mock_check_access_allow):
+    response = await http_client_api.post(
+        "/media",
+        data={"bucket_name": default_bucket.bucket_name},
+        files={"file": ("fooooo", "foooo")},
         headers={"Authorization": "Bearer token"},
     )
     assert response.status_code == status.HTTP_400_BAD_REQUEST, response.text
-    assert response.json()["error_code"] == SfsErrorCodes.SFS_BUCKET_NOT_FOUND
-    assert response.json()["error_message"] == "Bucket not found."
+    assert response.json()["error_code"] == SfsErrorCodes.SFS_INVALID_FILE
 
     mock_check_access_allow.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_upload_media_invalid_file(http_client_api, default_bucket, mock_check_access_allow):
     response = await http_client_api.post(
         "/media",
@@ -125,8 +203,7 @@ async def test_upload_media_invalid_file(http_client_api, default_bucket, mock_c
     mock_check_access_allow.assert_called_once()
 
 
-@pytest.mark.asyncio
-async def test_delete_media(http_client_api, default_media, mock_check_access_allow):
+async def test_delete_media(http_client_api, mock_boto_client, default_media, fixture_models, mock_check_access_allow):
 
     bucket_name, filename = default_media.bucket_name, default_media.filename
 
@@ -134,4 +211,40 @@ async def test_delete_media(http_client_api, default_media, mock_check_access_al
     assert response.status_code == status.HTTP_200_OK, response.text
     assert response.json()["message"] == "File deleted successfully."
 
+    mock_boto_client.delete_object.assert_called_once_with(Bucket=bucket_name, Key=default_media.name_in_minio)
+    assert await fixture_models.Media.find_one({"bucket_name": bucket_name, "name_in_minio": filename}) is None
+
     mock_check_access_allow.assert_called_once()
+
+
+async def test_delete_media_storage_failure_keeps_document(
+    http_client_api, mock_boto_client, default_media, fixture_models, mock_check_access_allow
+):
+    bucket_name, filename = default_media.bucket_name, default_media.filename
+    mock_boto_client.delete_object.side_effect = exceptions.ClientError(
+        error_response={"Error": {"Code": "403", "Message": "Forbidden"}, "ResponseMetadata": {"HTTPStatusCode": 403}},
+        operation_name="DeleteObject",
+    )
+
+    response = await http_client_api.delete(f"/media/{bucket_name}/{filename}", headers={"Authorization": "Bearer token"})
+    assert response.status_code == status.HTTP_403_FORBIDDEN, response.text
+    assert response.json()["error_code"] == SfsErrorCodes.SFS_INVALID_NAME
+
+    assert await fixture_models.Media.find_one({"bucket_name": bucket_name, "name_in_minio": filename}) is not None
+
+
+async def test_get_public_media_redirect(http_client_api, mock_boto_client, fixture_models, media_data):
+    from src.routers import media as media_router
+
+    media = await fixture_models.Media(**media_data, url="http://localhost/media", is_public=True, ttl_minutes=1).create()
+    mock_boto_client.generate_presigned_url.return_value = "http://minio/unsta-storage/signed"
+
+    with mock.patch.object(media_router, "settings", media_router.settings.model_copy(update={"STORAGE_PUBLIC_REDIRECT": True})):
+        response = await http_client_api.get(f"/media/public/{media.bucket_name}/{media.name_in_minio}")
+
+    assert response.status_code == status.HTTP_307_TEMPORARY_REDIRECT, response.text
+    assert response.headers["location"] == "http://minio/unsta-storage/signed"
+
+    # the URL never outlives the media time to live
+    expires_in = mock_boto_client.generate_presigned_url.call_args.kwargs["ExpiresIn"]
+    assert 0 < expires_in <= 60
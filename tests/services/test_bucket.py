@@ -0,0 +1,16 @@
+from unittest import mock
+
+
+def test_empty_bucket_sends_batches():
+    from src.services.bucket import _empty_bucket
+
+    botoclient = mock.Mock()
+    keys = [f"file-{index}" for index in range(2000)] + [None, "last"]
+    botoclient.get_paginator.return_value.paginate.return_value.search.return_value = iter(keys)
+
+    _empty_bucket("unsta-storage", botoclient)
+
+    batches = [call.kwargs["Delete"]["Objects"] for call in botoclient.delete_objects.call_args_list]
+    assert sorted(len(batch) for batch in batches) == [1, 1000, 1000]
+    botoclient.delete_bucket.assert_not_called()
+    botoclient.get_paginator.return_value.paginate.return_value.search.assert_called_once_with("Contents[].Key")
@@ -0,0 +1,70 @@
+from datetime import timedelta
+from unittest import mock
+
+
+async def test_get_media_metadata_uses_head_object():
+    from src.services.media import get_media_metadata
+
+    botoclient = mock.Mock()
+    botoclient.head_object.return_value = {"ContentType": "image/png", "ContentLength": 42, "ETag": '"abc"', "Body": None}
+
+    metadata = await get_media_metadata("picture.png", bucket_name="unsta-storage", botoclient=botoclient)
+    assert metadata == {"ContentType": "image/png", "ContentLength": 42, "ETag": '"abc"', "LastModified": None}
+
+    botoclient.head_object.assert_called_once_with(Bucket="unsta-storage", Key="picture.png")
+    botoclient.get_object.assert_not_called()
+
+
+async def test_upload_media_tags_are_url_encoded():
+    from io import BytesIO
+
+    from fastapi import UploadFile
+
+    from src.services.media import _upload_media_to_minio
+
+    botoclient = mock.Mock()
+    file = UploadFile(file=BytesIO(b"x"), filename="picture.png")
+
+    with mock.patch("src.services.media.check_bucket_exists", new=mock.AsyncMock()):
+        await _upload_media_to_minio(
+            file, "picture.png", tags={"owner": "unsta sfs", "size": 42}, bucket_name="unsta-storage", botoclient=botoclient
+        )
+
+    extra_args = botoclient.upload_fileobj.call_args.kwargs["ExtraArgs"]
+    assert extra_args["Tagging"] == "owner=unsta+sfs&size=42"
+
+
+async def test_find_public_media_with_legacy_ttl_document(fixture_models):
+    from datetime import datetime, UTC
+
+    from src.services.media import find_public_media
+
+    collection = fixture_models.Media.get_motor_collection()
+    now = datetime.now(UTC)
+    for filename, updated_at in (("fresh.png", now), ("stale.png", now - timedelta(hours=2))):
+        # written before expires_at existed, so the field is missing
+        await collection.insert_one(
+            {
+                "filename": filename,
+                "name_in_minio": filename,
+                "bucket_name": "unsta-storage",
+                "url": f"http://localhost/media/unsta-storage/{filename}",
+                "is_public": True,
+                "ttl_minutes": 60,
+                "created_at": updated_at,
+                "updated_at": updated_at,
+            }
+        )
+
+    media = await find_public_media(bucket_name="unsta-storage", filename="fresh.png")
+    assert media is not None and media.name_in_minio == "fresh.png"
+    assert await find_public_media(bucket_name="unsta-storage", filename="stale.png") is None
+
+
+async def test_media_expiration_follows_ttl(fixture_models, media_data):
+    media = await fixture_models.Media(**media_data, url="http://localhost/media", ttl_minutes=5).create()
+    assert media.expires_at == media.updated_at + timedelta(minutes=5)
+
+    media.ttl_minutes = None
+    await media.save()
+    assert (await fixture_models.Media.get(media.id)).expires_at is None